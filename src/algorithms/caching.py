@@ -1,31 +1,560 @@
-from typing import Callable, Any
+"""Time-based memoization with LRU bounds, pluggable cache keys and an optional
+SQLite tier shared between processes."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Any, Hashable, NamedTuple
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
 import time
 
 
-def time_based_cache(expiry_seconds: int) -> Callable:
-    """Manual implementation of a time-based cache decorator."""
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    stale_hits: int
+    maxsize: int | None
+    currsize: int
+
+
+def repr_key(args: tuple, kwargs: dict) -> str:
+    """Build a cache key by repr-ing every argument (the historical behaviour)."""
+    key_parts = [repr(arg) for arg in args]
+    key_parts.extend(f"{k}:{repr(v)}" for k, v in sorted(kwargs.items()))
+    return ":".join(key_parts)
+
+
+def _fingerprint(value: Any) -> Hashable:
+    """Return a compact hashable stand-in for a single argument.
+
+    Containers are fingerprinted element by element, so arrays nested in lists,
+    tuples, dicts or object arrays are digested like top-level ones.
+    """
+    if (
+        hasattr(value, "dtype")
+        and hasattr(value, "tobytes")
+        and hasattr(value, "shape")
+    ):
+        if value.dtype.hasobject:
+            # Object arrays hold pointers, so their bytes say nothing about the values.
+            items = tuple(_fingerprint(item) for item in value.ravel().tolist())
+            return ("ndarray", str(value.dtype), value.shape, items)
+        digest = hashlib.blake2b(value.tobytes(), digest_size=16).hexdigest()
+        return ("ndarray", str(value.dtype), value.shape, digest)
+    if hasattr(value, "index") and hasattr(value, "to_numpy"):
+        import pandas as pd
+
+        row_hashes = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+        columns = tuple(value.columns) if hasattr(value, "columns") else value.name
+        return (type(value).__name__, columns, digest)
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_fingerprint(item) for item in value))
+    if isinstance(value, dict):
+        return (
+            type(value),
+            tuple((_fingerprint(k), _fingerprint(v)) for k, v in value.items()),
+        )
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_fingerprint(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            raise TypeError(
+                f"cannot build a cache key for {type(value).__name__!r}"
+            ) from exc
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return ("pickle", type(value), digest)
+    # Keep 1, 1.0 and True apart, like lru_cache(typed=True).
+    return (type(value), value)
+
+
+class _KwargsMark:
+    """Separates positional from keyword parts; its repr is stable across processes."""
+
+    def __repr__(self) -> str:
+        return "<kwargs>"
+
+
+_KWARGS_MARK = _KwargsMark()
+
+
+def hashed_key(args: tuple, kwargs: dict) -> tuple:
+    """Build a cache key that fingerprints arrays and frames instead of repr-ing them."""
+    key = tuple(_fingerprint(arg) for arg in args)
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(
+            (k, _fingerprint(v)) for k, v in sorted(kwargs.items())
+        )
+    return key
+
+
+class SQLiteCacheStore:
+    """On-disk cache tier backed by a SQLite file that several processes can share.
+
+    Rows are namespaced (normally by the decorated function's qualified name)
+    and keyed by a digest of ``repr(key)``. numpy arrays are stored as raw
+    buffers and read back with ``np.frombuffer``, so hits return read-only
+    arrays without an extra copy; everything else is pickled.
+    """
+
+    _PURGE_EVERY = 128
+
+    def __init__(self, path: str | os.PathLike, namespace: str = ""):
+        self.path = os.fspath(path)
+        self.namespace = namespace
+        self.hits = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections must not cross a fork, so reopen in child processes.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, created REAL NOT NULL, "
+                "kind TEXT NOT NULL, meta TEXT, payload BLOB, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (created)")
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        return hashlib.blake2b(repr(key).encode(), digest_size=20).hexdigest()
+
+    @staticmethod
+    def _encode(value: Any) -> tuple[str, str | None, bytes]:
+        if type(value).__module__ == "numpy" and type(value).__name__ == "ndarray":
+            if value.dtype.hasobject:
+                return "pickle", None, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            meta = json.dumps({"dtype": value.dtype.str, "shape": value.shape})
+            return "ndarray", meta, value.tobytes(order="C")
+        return "pickle", None, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(kind: str, meta: str | None, payload: bytes) -> Any:
+        if kind == "ndarray":
+            import numpy as np
+
+            header = json.loads(meta)
+            array = np.frombuffer(payload, dtype=np.dtype(header["dtype"]))
+            return array.reshape(header["shape"])
+        return pickle.loads(payload)
+
+    def get(self, key: Hashable, max_age: float, now: float | None = None):
+        """Return ``(found, value, created)`` for an entry younger than ``max_age``."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT created, kind, meta, payload FROM cache "
+                    "WHERE namespace = ? AND key = ?",
+                    (self.namespace, self._digest(key)),
+                )
+                .fetchone()
+            )
+        if row is None or now - row[0] >= max_age:
+            return False, None, None
+        self.hits += 1
+        return True, self._decode(row[1], row[2], row[3]), row[0]
+
+    def set(self, key: Hashable, value: Any, now: float | None = None) -> None:
+        if now is None:
+            now = time.time()
+        kind, meta, payload = self._encode(value)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, self._digest(key), now, kind, meta, payload),
+            )
+            conn.commit()
+            self._writes += 1
+
+    def purge(self, max_age: float, now: float | None = None) -> int:
+        """Delete this namespace's rows older than ``max_age`` seconds."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND created <= ?",
+                (self.namespace, now - max_age),
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            conn.commit()
+        self.hits = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire ``expiry_seconds`` after insertion.
+
+    Expired entries are kept for a further ``stale_seconds`` so they can be
+    served via :meth:`get_stale` while a refresh is running. An optional
+    ``backing`` store (e.g. :class:`SQLiteCacheStore`) is consulted on misses
+    and written through on every store, keeping the original insertion time;
+    values that cannot be pickled skip the backing store.
+    All methods are guarded by an internal lock and are thread-safe.
+    """
+
+    def __init__(
+        self,
+        expiry_seconds: float,
+        maxsize: int | None = None,
+        stale_seconds: float = 0,
+        backing: SQLiteCacheStore | None = None,
+    ):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize must be positive or None")
+        self.expiry_seconds = expiry_seconds
+        self.stale_seconds = stale_seconds
+        self.maxsize = maxsize
+        self.backing = backing
+        # ``_entries`` is kept in LRU order, ``_inserted`` in insertion (= expiry) order.
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._inserted: OrderedDict[Hashable, float] = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _remove(self, key: Hashable) -> None:
+        del self._entries[key]
+        del self._inserted[key]
+
+    def purge(self, now: float | None = None) -> int:
+        """Drop every entry past its stale window; returns how many were removed."""
+        if now is None:
+            now = time.time()
+        limit = self.expiry_seconds + self.stale_seconds
+        removed = 0
+        with self._lock:
+            while self._inserted:
+                key, timestamp = next(iter(self._inserted.items()))
+                if now - timestamp < limit:
+                    break
+                self._remove(key)
+                removed += 1
+            self.expirations += removed
+        return removed
+
+    def peek(self, key: Hashable, now: float | None = None) -> tuple[bool, Any]:
+        """Like :meth:`lookup` but leaves counters and LRU order untouched."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or now - entry[1] >= self.expiry_seconds:
+            return False, None
+        return True, entry[0]
+
+    def lookup(self, key: Hashable, now: float | None = None) -> tuple[bool, Any]:
+        """Return ``(found, value)`` for a fresh ``key``, updating hit/miss counters."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self.purge(now)
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.expiry_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+        if self.backing is not None:
+            found, value, created = self.backing.get(key, self.expiry_seconds, now)
+            if found:
+                with self._lock:
+                    self._put(key, value, created)
+                    self.hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def get_stale(self, key: Hashable) -> tuple[bool, Any]:
+        """Return ``(found, value)`` for an expired entry still in its stale window."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            self.stale_hits += 1
+            return True, entry[0]
+
+    def _put(self, key: Hashable, value: Any, now: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        # Entries promoted from the backing store can predate the newest ones;
+        # keep ``_inserted`` sorted by timestamp so purge() can stop early.
+        newer = []
+        for other, timestamp in reversed(self._inserted.items()):
+            if timestamp <= now:
+                break
+            newer.append(other)
+        self._entries[key] = (value, now)
+        self._inserted[key] = now
+        for other in reversed(newer):
+            self._inserted.move_to_end(other)
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                oldest, _ = self._entries.popitem(last=False)
+                del self._inserted[oldest]
+                self.evictions += 1
+
+    def store(self, key: Hashable, value: Any, now: float | None = None) -> None:
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self._put(key, value, now)
+        if self.backing is not None:
+            try:
+                self.backing.set(key, value, now)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                # Values that cannot be pickled are only cached in memory.
+                return
+            if self.backing._writes % SQLiteCacheStore._PURGE_EVERY == 0:
+                self.backing.purge(self.expiry_seconds + self.stale_seconds, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._inserted.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.stale_hits = 0
+        if self.backing is not None:
+            self.backing.clear()
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.expirations,
+                self.stale_hits,
+                self.maxsize,
+                len(self._entries),
+            )
+
+
+class _InFlight:
+    """A computation that concurrent callers for the same key can wait on."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+    def wait(self) -> Any:
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def time_based_cache(
+    expiry_seconds: int,
+    maxsize: int | None = None,
+    key_func: Callable[[tuple, dict], Hashable] = repr_key,
+    single_flight: bool = False,
+    stale_while_revalidate: float = 0,
+    disk_path: str | os.PathLike | None = None,
+) -> Callable:
+    """Manual implementation of a time-based cache decorator.
+
+    ``maxsize`` bounds the number of entries (least recently used are evicted
+    first) and ``key_func`` builds the key from ``(args, kwargs)``; pass
+    :func:`hashed_key` to fingerprint numpy/pandas arguments. The wrapper
+    exposes ``cache_info()``, ``cache_clear()`` and the underlying ``cache``.
+
+    With ``single_flight`` concurrent misses on one key share a single call of
+    ``func``. ``stale_while_revalidate`` serves results up to that many seconds
+    past expiry while one background refresh runs. ``async def`` functions get
+    an async wrapper that caches the awaited result (refreshes run as tasks on
+    the caller's event loop).
+
+    ``disk_path`` adds a :class:`SQLiteCacheStore` tier behind the in-memory
+    dict so results survive restarts and are shared by processes on one host.
+    Keys are persisted via ``repr``, so use a ``key_func`` whose keys have a
+    stable repr (both :func:`repr_key` and :func:`hashed_key` do).
+    """
 
     def decorator(func: Callable) -> Callable:
-        cache: dict[str, tuple[Any, float]] = {}
+        backing = None
+        if disk_path is not None:
+            backing = SQLiteCacheStore(
+                disk_path, namespace=f"{func.__module__}.{func.__qualname__}"
+            )
+        cache = TTLCache(expiry_seconds, maxsize, stale_while_revalidate, backing)
+        if inspect.iscoroutinefunction(func):
+            wrapper = _async_wrapper(func, cache, key_func, single_flight)
+        else:
+            wrapper = _sync_wrapper(func, cache, key_func, single_flight)
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
 
-        def wrapper(*args, **kwargs) -> Any:
-            key_parts = [repr(arg) for arg in args]
-            key_parts.extend(f"{k}:{repr(v)}" for k, v in sorted(kwargs.items()))
-            key = ":".join(key_parts)
+def _sync_wrapper(
+    func: Callable, cache: TTLCache, key_func: Callable, single_flight: bool
+) -> Callable:
+    in_flight: dict[Hashable, _InFlight] = {}
+    in_flight_lock = threading.Lock()
 
-            current_time = time.time()
+    def compute(key: Hashable, args: tuple, kwargs: dict, call: _InFlight) -> Any:
+        try:
+            call.result = func(*args, **kwargs)
+            cache.store(key, call.result)
+        except BaseException as exc:
+            call.error = exc
+        finally:
+            with in_flight_lock:
+                in_flight.pop(key, None)
+            call.event.set()
+        return call.wait()
 
-            if key in cache:
-                result, timestamp = cache[key]
-                if current_time - timestamp < expiry_seconds:
-                    return result
+    def join_or_lead(key: Hashable) -> tuple[_InFlight, bool]:
+        with in_flight_lock:
+            call = in_flight.get(key)
+            if call is not None:
+                return call, False
+            call = in_flight[key] = _InFlight()
+            return call, True
 
+    def refresh(key: Hashable, args: tuple, kwargs: dict, call: _InFlight) -> None:
+        try:
+            compute(key, args, kwargs, call)
+        except Exception:
+            pass  # keep serving the stale value until it leaves the stale window
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        key = key_func(args, kwargs)
+        current_time = time.time()
+
+        found, result = cache.lookup(key, current_time)
+        if found:
+            return result
+
+        if cache.stale_seconds:
+            found, result = cache.get_stale(key)
+            if found:
+                call, leader = join_or_lead(key)
+                if leader:
+                    threading.Thread(
+                        target=refresh, args=(key, args, kwargs, call), daemon=True
+                    ).start()
+                return result
+
+        if not single_flight:
             result = func(*args, **kwargs)
+            cache.store(key, result, current_time)
+            return result
+
+        call, leader = join_or_lead(key)
+        if not leader:
+            return call.wait()
+        # Another leader may have finished between our miss and taking the slot.
+        found, result = cache.peek(key)
+        if found:
+            call.result = result
+            with in_flight_lock:
+                in_flight.pop(key, None)
+            call.event.set()
+            return result
+        return compute(key, args, kwargs, call)
+
+    return wrapper
+
 
-            cache[key] = (result, current_time)
+def _async_wrapper(
+    func: Callable, cache: TTLCache, key_func: Callable, single_flight: bool
+) -> Callable:
+    tasks: dict[Hashable, asyncio.Task] = {}
 
+    async def compute(key: Hashable, args: tuple, kwargs: dict) -> Any:
+        try:
+            result = await func(*args, **kwargs)
+            cache.store(key, result)
             return result
+        finally:
+            tasks.pop(key, None)
 
-        return wrapper
+    def start(key: Hashable, args: tuple, kwargs: dict) -> asyncio.Task:
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = asyncio.ensure_future(compute(key, args, kwargs))
+            # Mark failures as retrieved; awaiting callers still see them.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
 
-    return decorator
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> Any:
+        key = key_func(args, kwargs)
+        current_time = time.time()
+
+        found, result = cache.lookup(key, current_time)
+        if found:
+            return result
+
+        if cache.stale_seconds:
+            found, result = cache.get_stale(key)
+            if found:
+                start(key, args, kwargs)
+                return result
+
+        if not single_flight:
+            result = await func(*args, **kwargs)
+            cache.store(key, result, current_time)
+            return result
+
+        return await asyncio.shield(start(key, args, kwargs))
+
+    return wrapper
@@ -1,14 +1,217 @@
 from __future__ import annotations
 
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, Tuple, Union
+
+import numpy as np
+
+
+@lru_cache(maxsize=128)
+def _fib_pair(n: int) -> tuple[int, int]:
+    """``(F(n), F(n + 1))`` by fast doubling; the LRU lets nearby queries share ancestors."""
+    if n == 0:
+        return 0, 1
+    a, b = _fib_pair(n >> 1)
+    c = a * (2 * b - a)  # F(2k)
+    d = a * a + b * b  # F(2k + 1)
+    if n & 1:
+        return d, c + d
+    return c, d
+
 
 def fibonacci(n):
     if n <= 1:
         return n
-    return fibonacci(n - 1) + fibonacci(n - 2)
+    return _fib_pair(n)[0]
+
+
+def fib_mod(n: int, m: int) -> int:
+    """F(n) mod m in O(log n) multiplications of numbers below m."""
+    if m <= 0:
+        raise ValueError("Modulus must be positive")
+    if n <= 1:
+        return n % m
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        a, b = (d, (c + d) % m) if bit == "1" else (c, d)
+    return a
+
+
+def fibonacci_batch(ns: list[int], m: int | None = None) -> list[int] | np.ndarray:
+    """
+    Fibonacci numbers for many indices at once from a shared doubling ladder.
+
+    Args:
+        ns: Indices (values <= 1 map to themselves, as in ``fibonacci``)
+        m: Optional modulus
+
+    Returns:
+        A list of exact values, or with ``m`` an array of ``F(n) mod m``
+        computed for all indices in the same vectorized doubling steps
+    """
+    if m is not None:
+        if m <= 0:
+            raise ValueError("Modulus must be positive")
+        indices = np.asarray(ns, dtype=np.int64)
+        small = indices <= 1
+        steps = np.where(small, 0, indices)
+        # Products stay below 2**63 for int64 when m < 2**31; otherwise use Python ints.
+        dtype = np.int64 if m < 2**31 else object
+        a = np.zeros(len(indices), dtype=dtype)
+        b = np.ones(len(indices), dtype=dtype)
+        for shift in range(int(steps.max(initial=0)).bit_length() - 1, -1, -1):
+            c = a * ((2 * b - a) % m) % m
+            d = (a * a + b * b) % m
+            bit = ((steps >> shift) & 1).astype(bool)
+            a, b = np.where(bit, d, c), np.where(bit, (c + d) % m, d)
+        return np.where(small, indices % m, a)
+
+    # Python ints: numpy integers have no bit_length and would overflow anyway.
+    ns = [int(n) for n in ns]
+    # Every index needs the pairs of all its binary prefixes; compute each once.
+    pairs: dict[int, tuple[int, int]] = {0: (0, 1)}
+    prefixes = sorted(
+        {n >> shift for n in ns if n > 1 for shift in range(n.bit_length())}
+    )
+    for p in prefixes:
+        if p in pairs:
+            continue
+        a, b = pairs[p >> 1]
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        pairs[p] = (d, c + d) if p & 1 else (c, d)
+    return [pairs[n][0] if n > 1 else n for n in ns]
+
+
+def matrix_sum(matrix: list[list[int]] | np.ndarray) -> list[int]:
+    if isinstance(matrix, np.ndarray):
+        return list(iter_positive_row_sums(matrix))
+    return [total for total in map(sum, matrix) if total > 0]
 
 
-def matrix_sum(matrix: list[list[int]]) -> list[int]:
-    return [sum(matrix[i]) for i in range(len(matrix)) if sum(matrix[i]) > 0]
+def _positive_block_sums(block: np.ndarray) -> np.ndarray:
+    totals = block.sum(axis=1)
+    return totals[totals > 0]
+
+
+def _iter_positive_blocks(
+    matrix: np.ndarray, chunk_rows: int, workers: int | None
+) -> Iterator[np.ndarray]:
+    """Positive row sums of consecutive row blocks, in order.
+
+    Only one block (or ``2 * workers`` blocks with threads) is read at a time,
+    so ``np.memmap`` inputs never have to be loaded in full.
+    """
+    starts = range(0, matrix.shape[0], chunk_rows)
+    if workers is None or workers <= 1:
+        for start in starts:
+            yield _positive_block_sums(matrix[start : start + chunk_rows])
+        return
+
+    # numpy releases the GIL while summing, so threads overlap I/O and compute.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in starts:
+            block = matrix[start : start + chunk_rows]
+            pending.append(pool.submit(_positive_block_sums, block))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_positive_row_sums(
+    matrix: np.ndarray, chunk_rows: int = 65_536, workers: int | None = None
+) -> Iterator[int | float]:
+    """
+    Stream the positive row sums of a 2-D array, one row block at a time.
+
+    Args:
+        matrix: A 2-D array, typically an ``np.memmap`` of a row-major dump
+        chunk_rows: Rows summed per block
+        workers: Threads summing blocks concurrently
+
+    Returns:
+        An iterator over the positive row sums, in row order
+    """
+    for totals in _iter_positive_blocks(matrix, chunk_rows, workers):
+        yield from totals.tolist()
+
+
+def write_positive_row_sums(
+    matrix: np.ndarray,
+    out_path: str | os.PathLike,
+    chunk_rows: int = 65_536,
+    workers: int | None = None,
+) -> np.memmap:
+    """
+    Write the positive row sums of ``matrix`` to a raw binary file.
+
+    Args:
+        matrix: A 2-D array or ``np.memmap``
+        out_path: Destination file, overwritten
+        chunk_rows: Rows summed per block
+        workers: Threads summing blocks concurrently
+
+    Returns:
+        A read-only ``np.memmap`` over the written sums
+    """
+    dtype = np.zeros(0, dtype=matrix.dtype).sum(axis=0).dtype
+    count = 0
+    with open(out_path, "wb") as handle:
+        for totals in _iter_positive_blocks(matrix, chunk_rows, workers):
+            totals.astype(dtype, copy=False).tofile(handle)
+            count += len(totals)
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(out_path, dtype=dtype, mode="r", shape=(count,))
+
+
+ChainPlan = Union[int, Tuple["ChainPlan", "ChainPlan"]]
+
+
+def matrix_chain_plan(matrices: list[tuple[int, int]]) -> tuple[int, ChainPlan]:
+    """
+    Find the cheapest way to multiply a chain of matrices in O(n^3) time.
+
+    Args:
+        matrices: A list of matrix dimensions as tuples (rows, cols)
+
+    Returns:
+        ``(cost, plan)`` where ``plan`` is a matrix index or a ``(left, right)``
+        pair of sub-plans, e.g. ``((0, 1), 2)`` for ``(A0 @ A1) @ A2``
+    """
+    n = len(matrices)
+    if n == 0:
+        raise ValueError("At least one matrix is required")
+    rows = [m[0] for m in matrices]
+    cols = [m[1] for m in matrices]
+
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            best = None
+            for k in range(i, j):
+                candidate = cost[i][k] + cost[k + 1][j] + rows[i] * cols[k] * cols[j]
+                if best is None or candidate < best:
+                    best = candidate
+                    split[i][j] = k
+            cost[i][j] = best
+
+    def build(i: int, j: int) -> ChainPlan:
+        if i == j:
+            return i
+        k = split[i][j]
+        return (build(i, k), build(k + 1, j))
+
+    return cost[0][n - 1], build(0, n - 1)
 
 
 def matrix_chain_order(matrices: list[tuple[int, int]]) -> int:
@@ -21,25 +224,62 @@ def matrix_chain_order(matrices: list[tuple[int, int]]) -> int:
     Returns:
         Minimum number of operations
     """
-    n = len(matrices)
+    if not matrices:
+        return float("inf")
+    return matrix_chain_plan(matrices)[0]
 
-    def dp(i: int, j: int) -> int:
-        if i == j:
-            return 0
 
-        min_ops = float("inf")
+def multiply_chain(arrays: list[np.ndarray]) -> np.ndarray:
+    """
+    Multiply ``arrays[0] @ arrays[1] @ ...`` in the order chosen by ``matrix_chain_plan``.
 
-        for k in range(i, j):
-            cost = (
-                dp(i, k)
-                + dp(k + 1, j)
-                + matrices[i][0] * matrices[k][1] * matrices[j][1]
-            )
-            min_ops = min(min_ops, cost)
+    Args:
+        arrays: 2-D arrays with compatible inner dimensions
 
-        return min_ops
+    Returns:
+        The matrix product
+    """
+    if not arrays:
+        raise ValueError("At least one matrix is required")
+    for left, right in zip(arrays, arrays[1:]):
+        if left.shape[1] != right.shape[0]:
+            raise ValueError("Incompatible matrices")
+    _, plan = matrix_chain_plan([a.shape for a in arrays])
 
-    return dp(0, n - 1)
+    # Evaluate the plan tree with an explicit stack (post-order).
+    results: list[np.ndarray] = []
+    stack: list[tuple[ChainPlan, bool]] = [(plan, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, int):
+            results.append(arrays[node])
+        elif expanded:
+            right = results.pop()
+            left = results.pop()
+            results.append(np.matmul(left, right))
+        else:
+            stack.append((node, True))
+            stack.append((node[1], False))
+            stack.append((node[0], False))
+    return results[0]
+
+
+def _coin_ways(coins: list[int], max_amount: int) -> np.ndarray:
+    """``ways[a]`` = number of coin combinations summing to ``a`` for ``a <= max_amount``."""
+    if any(coin <= 0 for coin in coins):
+        raise ValueError("Coins must be positive")
+    ways = np.zeros(max_amount + 1, dtype=np.int64)
+    ways[0] = 1
+    for coin in coins:
+        if coin > max_amount:
+            continue
+        # Switch to exact Python ints before the int64 cumulative sums could overflow.
+        if ways.dtype != object and ways.sum(dtype=np.float64) >= 2**62:
+            ways = ways.astype(object)
+        # Unbounded use of ``coin``: a running sum along each residue class mod coin.
+        for residue in range(coin):
+            ways[residue::coin] = np.cumsum(ways[residue::coin])
+    return ways
 
 
 def coin_change(coins: list[int], amount: int, index: int) -> int:
@@ -48,19 +288,71 @@ def coin_change(coins: list[int], amount: int, index: int) -> int:
     if amount < 0 or index >= len(coins):
         return 0
 
-    return coin_change(coins, amount - coins[index], index) + coin_change(
-        coins, amount, index + 1
-    )
+    return int(_coin_ways(coins[index:], amount)[amount])
+
+
+def coin_change_batch(coins: list[int], amounts: list[int]) -> list[int]:
+    """Number of ways to make each of ``amounts`` from ``coins``, from one shared table."""
+    if not amounts:
+        return []
+    ways = _coin_ways(coins, max(max(amounts), 0))
+    return [int(ways[amount]) if amount >= 0 else 0 for amount in amounts]
+
+
+def _knapsack_table(
+    weights: list[int], values: list[int], capacity: int, keep: bool = False
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Rolling 0/1 knapsack table: ``best[c]`` = max value with total weight <= ``c``.
+
+    With ``keep`` also returns an ``(n, capacity + 1)`` boolean matrix of take
+    decisions for reconstructing the chosen items.
+    """
+    if any(weight < 0 for weight in weights):
+        raise ValueError("Weights must be non-negative")
+    best = np.zeros(capacity + 1, dtype=np.result_type(np.int64, *values))
+    taken = np.zeros((len(weights), capacity + 1), dtype=bool) if keep else None
+    for item, (weight, value) in enumerate(zip(weights, values)):
+        if weight > capacity:
+            continue
+        candidate = best[: capacity + 1 - weight] + value
+        current = best[weight:]
+        take = candidate > current
+        if keep:
+            taken[item, weight:] = take
+        best[weight:] = np.where(take, candidate, current)
+    return best, taken
 
 
 def knapsack(weights: list[int], values: list[int], capacity: int, n: int) -> int:
-    if n == 0 or capacity == 0:
+    if n == 0 or capacity <= 0:
         return 0
 
-    if weights[n - 1] > capacity:
-        return knapsack(weights, values, capacity, n - 1)
+    return _knapsack_table(weights[:n], values[:n], capacity)[0][capacity].item()
 
-    return max(
-        values[n - 1] + knapsack(weights, values, capacity - weights[n - 1], n - 1),
-        knapsack(weights, values, capacity, n - 1),
-    )
+
+def knapsack_items(
+    weights: list[int], values: list[int], capacity: int
+) -> tuple[int, list[int]]:
+    """Best knapsack value and the (ascending) indices of the items achieving it."""
+    if capacity <= 0:
+        return 0, []
+    best, taken = _knapsack_table(weights, values, capacity, keep=True)
+    chosen = []
+    remaining = capacity
+    for item in range(len(weights) - 1, -1, -1):
+        if taken[item, remaining]:
+            chosen.append(item)
+            remaining -= weights[item]
+    chosen.reverse()
+    return best[capacity].item(), chosen
+
+
+def knapsack_batch(
+    weights: list[int], values: list[int], capacities: list[int]
+) -> np.ndarray:
+    """Best knapsack value for each capacity, answered from a single table pass."""
+    capacities = np.asarray(capacities, dtype=np.int64)
+    if capacities.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    best, _ = _knapsack_table(weights, values, max(int(capacities.max()), 0))
+    return np.where(capacities > 0, best[np.clip(capacities, 0, None)], 0)
@@ -1,9 +1,163 @@
 from __future__ import annotations
 
-import networkx as nx
-
-
-def graph_traversal(graph: dict[int, dict[int]], node: int) -> dict[int]:
+import heapq
+import random
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Hashable, Iterable, NamedTuple
+
+import numpy as np
+
+
+def _compress(
+    n: int, src: np.ndarray, dst: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(indptr, indices)`` grouping ``dst`` by ``src``, keeping edge order."""
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+class CSRGraph:
+    """Directed graph stored as CSR (out-edges) and CSC (in-edges) integer arrays.
+
+    Nodes get dense integer ids in first-seen order; ``labels[i]`` maps an id
+    back to its label and ``index`` maps labels to ids. ``data[i]`` holds the
+    node dict a flow graph was built from, or ``None`` for nodes that only
+    appear as edge endpoints. Parallel edges are kept. The object also behaves
+    like a read-only ``dict[label, list[label]]`` adjacency mapping.
+    """
+
+    def __init__(
+        self,
+        labels: list[Hashable],
+        src: np.ndarray,
+        dst: np.ndarray,
+        data: list[Any] | None = None,
+    ):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.has_data = data is not None
+        self.data = data if data is not None else [None] * len(labels)
+        n = len(labels)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        self.indptr, self.indices = _compress(n, src, dst)
+        self.in_indptr, self.in_indices = _compress(n, dst, src)
+
+    @classmethod
+    def from_edges(
+        cls, edges: Iterable[tuple[Hashable, Hashable]], nodes: Iterable[Hashable] = ()
+    ) -> CSRGraph:
+        """Build from ``(source, target)`` tuples; ``nodes`` fixes ids of isolated nodes."""
+        index: dict[Hashable, int] = {}
+        labels: list[Hashable] = []
+
+        def node_id(label: Hashable) -> int:
+            i = index.get(label)
+            if i is None:
+                i = index[label] = len(labels)
+                labels.append(label)
+            return i
+
+        for label in nodes:
+            node_id(label)
+        src: list[int] = []
+        dst: list[int] = []
+        for u, v in edges:
+            src.append(node_id(u))
+            dst.append(node_id(v))
+        return cls(labels, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+
+    @classmethod
+    def from_flow(cls, nodes: list[dict], edges: Iterable[dict]) -> CSRGraph:
+        """Build from ``{"id": ...}`` node dicts and ``{"source", "target"}`` edge dicts."""
+        graph = cls.from_edges(
+            ((edge["source"], edge["target"]) for edge in edges),
+            (node["id"] for node in nodes),
+        )
+        graph.has_data = True
+        for node in nodes:
+            graph.data[graph.index[node["id"]]] = node
+        return graph
+
+    @classmethod
+    def from_adjacency(cls, adjacency: dict[Hashable, Iterable[Hashable]]) -> CSRGraph:
+        """Build from a ``dict[node, list[neighbor]]`` adjacency mapping."""
+        return cls.from_edges(
+            ((u, v) for u, targets in adjacency.items() for v in targets), adjacency
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_indptr)
+
+    def successors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.in_indices[self.in_indptr[i] : self.in_indptr[i + 1]]
+
+    def edges(self) -> list[tuple[Hashable, Hashable]]:
+        """Return the edges as ``(source_label, target_label)`` tuples."""
+        labels = self.labels
+        sources = np.repeat(np.arange(self.num_nodes), self.out_degree())
+        return [
+            (labels[u], labels[v])
+            for u, v in zip(sources.tolist(), self.indices.tolist())
+        ]
+
+    def node(self, i: int) -> Any:
+        """Return the node dict for id ``i`` (its label if built without node dicts).
+
+        Raises ``KeyError`` for flow-graph nodes that only appear in edges.
+        """
+        if not self.has_data:
+            return self.labels[i]
+        node = self.data[i]
+        if node is None:
+            raise KeyError(self.labels[i])
+        return node
+
+    def declared(self) -> np.ndarray:
+        """Ids of nodes that were declared (all ids for graphs without node dicts)."""
+        if not self.has_data:
+            return np.arange(self.num_nodes)
+        return np.flatnonzero([node is not None for node in self.data])
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: Hashable) -> bool:
+        return label in self.index
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __getitem__(self, label: Hashable) -> list[Hashable]:
+        labels = self.labels
+        return [labels[v] for v in self.successors(self.index[label]).tolist()]
+
+    def get(self, label: Hashable, default: Any = None) -> Any:
+        if label not in self.index:
+            return default
+        return self[label]
+
+
+def graph_traversal(graph: dict[int, dict[int]] | CSRGraph, node: int) -> dict[int]:
     visited = []
 
     def dfs(n: int) -> None:
@@ -18,40 +172,349 @@ def graph_traversal(graph: dict[int, dict[int]], node: int) -> dict[int]:
 
 
 class PathFinder:
-    def __init__(self, graph: dict[str, list[str]]):
+    """Shortest-path queries over an unweighted directed graph.
+
+    The adjacency is indexed into a :class:`CSRGraph` on first use and reused
+    by every query. Results are memoized in an LRU of ``cache_size`` entries;
+    mutate the graph through :meth:`add_edge` / :meth:`remove_edge` (or call
+    :meth:`invalidate` after changing ``graph`` directly) to drop stale results.
+    """
+
+    def __init__(self, graph: dict[str, list[str]] | CSRGraph, cache_size: int = 1024):
         self.graph = graph
+        self.cache_size = cache_size
+        self._index: CSRGraph | None = graph if isinstance(graph, CSRGraph) else None
+        self._arrays: tuple[list[int], ...] | None = None
+        self._cache: OrderedDict[tuple[str, str], tuple[str, ...]] = OrderedDict()
+
+    def invalidate(self) -> None:
+        """Forget the index and cached results after ``graph`` has changed."""
+        self._index = self.graph if isinstance(self.graph, CSRGraph) else None
+        self._arrays = None
+        self._cache.clear()
+
+    def add_edge(self, source: str, target: str) -> None:
+        self.graph.setdefault(source, []).append(target)
+        self.invalidate()
+
+    def remove_edge(self, source: str, target: str) -> None:
+        self.graph[source].remove(target)
+        self.invalidate()
+
+    @property
+    def index(self) -> CSRGraph:
+        if self._index is None:
+            self._index = CSRGraph.from_adjacency(self.graph)
+        if self._arrays is None:
+            index = self._index
+            self._arrays = (
+                index.indptr.tolist(),
+                index.indices.tolist(),
+                index.in_indptr.tolist(),
+                index.in_indices.tolist(),
+            )
+        return self._index
+
+    def _remember(self, key: tuple[str, str], path: list[str]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = tuple(path)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cached(self, key: tuple[str, str]) -> list[str] | None:
+        path = self._cache.get(key)
+        if path is None:
+            return None
+        self._cache.move_to_end(key)
+        return list(path)
 
     def find_shortest_path(self, start: str, end: str) -> list[str]:
         if start not in self.graph or end not in self.graph:
             return []
 
-        queue = [[start]]
-        visited = set([start])
+        key = (start, end)
+        path = self._cached(key)
+        if path is None:
+            path = self._bidirectional(start, end)
+            self._remember(key, path)
+        return path
+
+    def _bidirectional(self, start: str, end: str) -> list[str]:
+        """Bidirectional BFS with parent pointers, expanding the smaller frontier."""
+        index = self.index
+        s, t = index.index[start], index.index[end]
+        if s == t:
+            return [start]
+        indptr, indices, in_indptr, in_indices = self._arrays
+
+        parent = {s: -1}  # forward: node -> predecessor on the path from start
+        child = {t: -1}  # backward: node -> successor on the path to end
+        depth_f = {s: 0}
+        depth_b = {t: 0}
+        frontier_f, frontier_b = [s], [t]
+
+        while frontier_f and frontier_b:
+            forward = len(frontier_f) <= len(frontier_b)
+            if forward:
+                frontier, ptr, idx = frontier_f, indptr, indices
+                seen, other, depth, other_depth = parent, child, depth_f, depth_b
+            else:
+                frontier, ptr, idx = frontier_b, in_indptr, in_indices
+                seen, other, depth, other_depth = child, parent, depth_b, depth_f
+
+            best = None
+            next_frontier = []
+            for v in frontier:
+                for w in idx[ptr[v] : ptr[v + 1]]:
+                    if w not in seen:
+                        seen[w] = v
+                        depth[w] = depth[v] + 1
+                        next_frontier.append(w)
+                    if w in other:
+                        total = depth[v] + 1 + other_depth[w]
+                        if best is None or total < best:
+                            best = total
+                            joint = (v, w) if forward else (w, v)
+            if best is not None:
+                return self._join(joint, parent, child)
+
+            if forward:
+                frontier_f = next_frontier
+            else:
+                frontier_b = next_frontier
 
-        while queue:
-            path = queue.pop(0)
-            node = path[-1]
+        return []  # No path found
+
+    def _join(
+        self, joint: tuple[int, int], parent: dict[int, int], child: dict[int, int]
+    ) -> list[str]:
+        """Stitch the forward path to ``joint[0]`` and backward path from ``joint[1]``."""
+        labels = self.index.labels
+        head = []
+        node = joint[0]
+        while node != -1:
+            head.append(node)
+            node = parent[node]
+        head.reverse()
+        node = joint[1]
+        while node != -1:
+            head.append(node)
+            node = child[node]
+        return [labels[v] for v in head]
+
+    def find_shortest_paths(self, pairs: Iterable[tuple[str, str]]) -> list[list[str]]:
+        """Answer many ``(start, end)`` queries, running one BFS per distinct start."""
+        pairs = list(pairs)
+        results: list[list[str] | None] = [None] * len(pairs)
+        pending: dict[str, list[int]] = {}
+        for position, (start, end) in enumerate(pairs):
+            if start not in self.graph or end not in self.graph:
+                results[position] = []
+                continue
+            path = self._cached((start, end))
+            if path is None:
+                pending.setdefault(start, []).append(position)
+            else:
+                results[position] = path
+
+        index = self.index
+        labels = index.labels
+        indptr, indices = self._arrays[:2]
+        for start, positions in pending.items():
+            targets = {index.index[pairs[p][1]] for p in positions}
+            s = index.index[start]
+            parent = {s: -1}
+            remaining = targets - {s}
+            queue = deque([s])
+            while queue and remaining:
+                v = queue.popleft()
+                for w in indices[indptr[v] : indptr[v + 1]]:
+                    if w not in parent:
+                        parent[w] = v
+                        remaining.discard(w)
+                        queue.append(w)
+            for p in positions:
+                t = index.index[pairs[p][1]]
+                path = []
+                if t in parent:
+                    node = t
+                    while node != -1:
+                        path.append(labels[node])
+                        node = parent[node]
+                    path.reverse()
+                self._remember(pairs[p], path)
+                results[p] = path
+        return results
+
+
+class FlowGraphIndex:
+    """Mutable flow graph that keeps degree, leaf and max-degree indexes up to date.
+
+    Every add/remove of a node or edge costs O(log n) (removing a node also
+    removes its edges). ``last_node`` and ``node_with_highest_degree`` are
+    O(1) amortized and ``leaf_nodes`` is O(k log k) for k leaves. Answers match
+    :func:`find_last_node`, :func:`find_leaf_nodes` and
+    :func:`find_node_with_highest_degree` for the same nodes and edges, with
+    ties broken by node insertion order. Like the latter, the degree used for
+    ranking counts every outgoing edge but each source of incoming edges once.
+    """
+
+    def __init__(self, nodes: Iterable[dict] = (), edges: Iterable[dict] = ()):
+        self._nodes: dict[Hashable, dict] = {}
+        self._seq: dict[Hashable, int] = {}
+        self._next_seq = 0
+        self._out: dict[Hashable, Counter] = {}
+        self._in: dict[Hashable, Counter] = {}
+        self._out_degree: Counter = Counter()
+        self._in_degree: Counter = Counter()
+        self._leaves: set[Hashable] = set()
+        # Both heaps use lazy deletion: stale entries are skipped when they surface.
+        self._leaf_heap: list[tuple[int, Hashable]] = []
+        self._degree_heap: list[tuple[int, int, Hashable]] = []
+        for node in nodes:
+            self.add_node(node)
+        for edge in edges:
+            self.add_edge(edge)
 
-            if node == end:
-                return path
+    def __len__(self) -> int:
+        return len(self._nodes)
 
-            for neighbor in self.graph.get(node, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append(new_path)
+    def __contains__(self, node_id: Hashable) -> bool:
+        return node_id in self._nodes
 
-        return []  # No path found
+    def out_degree(self, node_id: Hashable) -> int:
+        return self._out_degree[node_id]
+
+    def in_degree(self, node_id: Hashable) -> int:
+        return self._in_degree[node_id]
 
+    def _ranking_degree(self, node_id: Hashable) -> int:
+        """Out-edges plus distinct in-neighbours, as find_node_with_highest_degree counts."""
+        return self._out_degree[node_id] + len(self._in.get(node_id, ()))
 
-def find_last_node(nodes, edges):
+    def _touch(self, node_id: Hashable) -> None:
+        """Refresh the leaf and degree indexes after ``node_id``'s degree changed."""
+        if node_id not in self._nodes:
+            return
+        seq = self._seq[node_id]
+        if self._out_degree[node_id] == 0:
+            if node_id not in self._leaves:
+                self._leaves.add(node_id)
+                heapq.heappush(self._leaf_heap, (seq, node_id))
+                if len(self._leaf_heap) > 2 * len(self._leaves) + 64:
+                    self._leaf_heap = [(self._seq[n], n) for n in self._leaves]
+                    heapq.heapify(self._leaf_heap)
+        else:
+            self._leaves.discard(node_id)
+        degree = self._ranking_degree(node_id)
+        heapq.heappush(self._degree_heap, (-degree, seq, node_id))
+        if len(self._degree_heap) > 2 * len(self._nodes) + 64:
+            self._degree_heap = [
+                (-self._ranking_degree(n), self._seq[n], n) for n in self._nodes
+            ]
+            heapq.heapify(self._degree_heap)
+
+    def add_node(self, node: dict) -> None:
+        """Add ``node`` (or replace the dict of an existing node with the same id)."""
+        node_id = node["id"]
+        if node_id not in self._nodes:
+            self._seq[node_id] = self._next_seq
+            self._next_seq += 1
+        self._nodes[node_id] = node
+        self._touch(node_id)
+
+    def remove_node(self, node_id: Hashable) -> None:
+        """Remove a node together with every edge touching it."""
+        for target, count in list(self._out.get(node_id, {}).items()):
+            for _ in range(count):
+                self.remove_edge({"source": node_id, "target": target})
+        for source, count in list(self._in.get(node_id, {}).items()):
+            for _ in range(count):
+                self.remove_edge({"source": source, "target": node_id})
+        del self._nodes[node_id]
+        del self._seq[node_id]
+        self._leaves.discard(node_id)
+
+    def add_edge(self, edge: dict) -> None:
+        source, target = edge["source"], edge["target"]
+        self._out.setdefault(source, Counter())[target] += 1
+        self._in.setdefault(target, Counter())[source] += 1
+        self._out_degree[source] += 1
+        self._in_degree[target] += 1
+        self._touch(source)
+        if target != source:
+            self._touch(target)
+
+    def remove_edge(self, edge: dict) -> None:
+        """Remove one occurrence of ``edge``; raises ``KeyError`` if it is absent."""
+        source, target = edge["source"], edge["target"]
+        targets = self._out.get(source)
+        if not targets or not targets[target]:
+            raise KeyError((source, target))
+        targets[target] -= 1
+        if not targets[target]:
+            del targets[target]
+            del self._in[target][source]
+        else:
+            self._in[target][source] -= 1
+        self._out_degree[source] -= 1
+        self._in_degree[target] -= 1
+        self._touch(source)
+        if target != source:
+            self._touch(target)
+
+    def last_node(self) -> dict | None:
+        """First node (in insertion order) without outgoing edges."""
+        heap = self._leaf_heap
+        while heap:
+            seq, node_id = heap[0]
+            if node_id in self._leaves and self._seq[node_id] == seq:
+                return self._nodes[node_id]
+            heapq.heappop(heap)
+        return None
+
+    def leaf_nodes(self) -> list[dict]:
+        """All nodes without outgoing edges, in insertion order."""
+        return [self._nodes[n] for n in sorted(self._leaves, key=self._seq.__getitem__)]
+
+    def node_with_highest_degree(self) -> Hashable | None:
+        """Id of the node with the highest ranking degree (earliest inserted on ties)."""
+        heap = self._degree_heap
+        while heap:
+            negative_degree, seq, node_id = heap[0]
+            if (
+                node_id in self._nodes
+                and self._seq[node_id] == seq
+                and self._ranking_degree(node_id) == -negative_degree
+            ):
+                return node_id
+            heapq.heappop(heap)
+        return None
+
+
+def find_last_node(nodes, edges=None):
     """This function receives a flow and returns the last node."""
+    if isinstance(nodes, FlowGraphIndex):
+        return nodes.last_node()
+    if isinstance(nodes, CSRGraph):
+        graph = nodes
+        ids = graph.declared()
+        sinks = ids[graph.out_degree()[ids] == 0]
+        return graph.node(int(sinks[0])) if len(sinks) else None
     return next((n for n in nodes if all(e["source"] != n["id"] for e in edges)), None)
 
 
-def find_leaf_nodes(nodes: list[dict], edges: list[dict]) -> list[dict]:
+def find_leaf_nodes(
+    nodes: list[dict] | CSRGraph, edges: list[dict] | None = None
+) -> list[dict]:
     """Find all leaf nodes (nodes with no outgoing edges)."""
+    if isinstance(nodes, FlowGraphIndex):
+        return nodes.leaf_nodes()
+    if isinstance(nodes, CSRGraph):
+        graph = nodes
+        ids = graph.declared()
+        return [graph.node(i) for i in ids[graph.out_degree()[ids] == 0].tolist()]
     leaf_nodes = []
     for node in nodes:
         is_leaf = True
@@ -64,24 +527,134 @@ def find_leaf_nodes(nodes: list[dict], edges: list[dict]) -> list[dict]:
     return leaf_nodes
 
 
-def find_cycle_vertices(edges):
-    """Find all vertices that are part of cycles in the graph."""
-    # Create a directed graph from the edges
-    graph = nx.DiGraph(edges)
+def _as_csr(edges) -> CSRGraph:
+    """Accept an edge list, an adjacency mapping or a graph object with ``edges()``."""
+    if isinstance(edges, CSRGraph):
+        return edges
+    if isinstance(edges, Mapping):
+        return CSRGraph.from_adjacency(edges)
+    if callable(getattr(edges, "edges", None)):
+        pairs = list(edges.edges())
+        if hasattr(edges, "is_directed") and not edges.is_directed():
+            # An undirected edge is a cycle through both of its ends.
+            pairs += [(v, u) for u, v in pairs]
+        nodes = edges.nodes() if hasattr(edges, "nodes") else ()
+        return CSRGraph.from_edges(pairs, nodes)
+    return CSRGraph.from_edges(edges)
+
+
+def find_cycle_vertices(edges, engine: str = "scc"):
+    """Find all vertices that are part of cycles in the graph.
+
+    A vertex lies on a cycle iff its strongly connected component has more
+    than one vertex or it has a self-loop, so this runs in O(V + E) without
+    enumerating cycles. ``edges`` may be ``(source, target)`` pairs, a
+    ``dict[node, list[neighbor]]`` adjacency mapping or a graph object such as
+    ``networkx.DiGraph``. ``engine="networkx"`` computes the components with
+    networkx instead of the built-in CSR implementation.
+    """
+    if engine == "networkx":
+        import networkx as nx
+
+        graph = nx.DiGraph(edges.edges() if isinstance(edges, CSRGraph) else edges)
+        cycle_vertices = {v for v, _ in nx.selfloop_edges(graph)}
+        for component in nx.strongly_connected_components(graph):
+            if len(component) > 1:
+                cycle_vertices.update(component)
+        return sorted(cycle_vertices)
+    if engine != "scc":
+        raise ValueError(f"Unsupported engine: {engine}")
+
+    graph = _as_csr(edges)
+    labels = graph.labels
+    sources = np.repeat(np.arange(graph.num_nodes), graph.out_degree())
+    cycle_vertices = {labels[v] for v in sources[sources == graph.indices].tolist()}
+    for component in _scc_ids(graph):
+        if len(component) > 1:
+            cycle_vertices.update(labels[v] for v in component)
+    return sorted(cycle_vertices)
 
-    # Find all simple cycles in the graph
-    cycles = list(nx.simple_cycles(graph))
 
-    # Flatten the list of cycles and remove duplicates
-    cycle_vertices = {vertex for cycle in cycles for vertex in cycle}
-
-    return sorted(cycle_vertices)
+class CycleVertexTracker:
+    """Incrementally maintain the set of vertices that lie on a directed cycle.
+
+    Adding ``u -> v`` closes new cycles only if ``u`` is reachable from ``v``;
+    the vertices gaining cycle membership are then those both reachable from
+    ``v`` and able to reach ``u``, found by a forward and a backward search.
+    """
+
+    def __init__(self, edges: Iterable[tuple[Hashable, Hashable]] = ()):
+        self._succ: dict[Hashable, set[Hashable]] = {}
+        self._pred: dict[Hashable, set[Hashable]] = {}
+        self._on_cycle: set[Hashable] = set()
+        self.add_edges(edges)
+
+    def add_edges(self, edges: Iterable[tuple[Hashable, Hashable]]) -> None:
+        for u, v in edges:
+            self.add_edge(u, v)
+
+    def add_edge(self, u: Hashable, v: Hashable) -> set[Hashable]:
+        """Add ``u -> v`` and return the vertices that newly joined a cycle."""
+        succ = self._succ.setdefault(u, set())
+        self._pred.setdefault(u, set())
+        self._succ.setdefault(v, set())
+        pred = self._pred.setdefault(v, set())
+        if v in succ:
+            return set()
+        succ.add(v)
+        pred.add(u)
+
+        if u == v:
+            added = {u} - self._on_cycle
+        else:
+            forward = self._reach(v, self._succ)
+            if u not in forward:
+                return set()
+            backward = self._reach(u, self._pred, within=forward)
+            added = backward - self._on_cycle
+        self._on_cycle.update(added)
+        return added
+
+    @staticmethod
+    def _reach(
+        start: Hashable,
+        adjacency: dict[Hashable, set[Hashable]],
+        within: set[Hashable] | None = None,
+    ) -> set[Hashable]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbor in adjacency[stack.pop()]:
+                if neighbor not in seen and (within is None or neighbor in within):
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def __contains__(self, vertex: Hashable) -> bool:
+        return vertex in self._on_cycle
+
+    def cycle_vertices(self) -> list[Hashable]:
+        """Return the same sorted list as :func:`find_cycle_vertices`."""
+        return sorted(self._on_cycle)
 
 
 def find_node_with_highest_degree(
-    nodes: list[str], connections: dict[str, list[str]]
+    nodes: list[str] | CSRGraph, connections: dict[str, list[str]] | None = None
 ) -> str:
     """Find the node with highest degree (most connections)."""
+    if isinstance(nodes, FlowGraphIndex):
+        return nodes.node_with_highest_degree()
+    if isinstance(nodes, CSRGraph):
+        graph = nodes
+        if not graph.num_nodes:
+            return None
+        # Incoming edges count once per distinct source, as in the loop below.
+        n = graph.num_nodes
+        sources = np.repeat(np.arange(n), np.diff(graph.indptr))
+        pairs = np.unique(sources * n + graph.indices)
+        degree = graph.out_degree() + np.bincount(pairs % n, minlength=n)
+        return graph.labels[int(np.argmax(degree))]
+
     max_degree = -1
     max_degree_node = None
 
@@ -102,157 +675,378 @@ def find_node_with_highest_degree(
     return max_degree_node
 
 
-def find_node_clusters(nodes: list[dict], edges: list[dict]) -> list[list[dict]]:
-    """Find connected components (clusters) in the graph."""
-    # Create node ID to node mapping for easy lookup
-    node_map = {node["id"]: node for node in nodes}
-
-    # Create an adjacency list
-    adjacency = {}
-    for edge in edges:
-        src = edge["source"]
-        tgt = edge["target"]
-
-        if src not in adjacency:
-            adjacency[src] = []
-        if tgt not in adjacency:
-            adjacency[tgt] = []
-
-        adjacency[src].append(tgt)
-        adjacency[tgt].append(src)  # Assuming undirected graph for clustering
-
-    # Track visited nodes
-    visited = set()
+class UnionFind:
+    """Array-backed disjoint-set forest for streaming connected components.
+
+    Memory grows with the number of distinct node ids, not with the number of
+    edges, so edges can come from any iterator or stream. Uses path halving
+    and union by rank; each ``add_edge`` is near O(1) amortized.
+    """
+
+    def __init__(self, nodes: Iterable[dict] = ()):
+        self._index: dict[Hashable, int] = {}
+        self._labels: list[Hashable] = []
+        self._data: list[dict | None] = []
+        self._parent = array("q")
+        self._rank = array("B")
+        self.components = 0
+        for node in nodes:
+            self.add_node(node)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def _id(self, label: Hashable) -> int:
+        i = self._index.get(label)
+        if i is None:
+            i = self._index[label] = len(self._labels)
+            self._labels.append(label)
+            self._data.append(None)
+            self._parent.append(i)
+            self._rank.append(0)
+            self.components += 1
+        return i
+
+    def add_node(self, node: dict) -> None:
+        """Declare a node; a later dict with the same id replaces the earlier one."""
+        self._data[self._id(node["id"])] = node
+
+    def find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing ids ``a`` and ``b``; returns False if already joined."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        rank = self._rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        self.components -= 1
+        return True
+
+    def add_edge(self, edge: dict | tuple[Hashable, Hashable]) -> None:
+        """Add an undirected edge given as a ``{"source", "target"}`` dict or a pair."""
+        if isinstance(edge, dict):
+            source, target = edge["source"], edge["target"]
+        else:
+            source, target = edge
+        self.union(self._id(source), self._id(target))
+
+    def add_edges(self, edges: Iterable[dict | tuple[Hashable, Hashable]]) -> None:
+        for edge in edges:
+            self.add_edge(edge)
+
+    def connected(self, a: Hashable, b: Hashable) -> bool:
+        return self.find(self._index[a]) == self.find(self._index[b])
+
+    def clusters(self) -> list[list[dict]]:
+        """Components containing a declared node, as lists of node dicts.
+
+        Clusters and their members come in order of first appearance (declared
+        nodes first, then ids first seen in edges), not in BFS order.
+
+        Raises ``KeyError`` if such a component also contains a node id that
+        only appeared in edges, matching :func:`find_node_clusters`.
+        """
+        groups: dict[int, list[int]] = {}
+        for i in range(len(self._labels)):
+            groups.setdefault(self.find(i), []).append(i)
+        data = self._data
+        clusters = []
+        for members in groups.values():
+            cluster = [data[i] for i in members]
+            if any(node is not None for node in cluster):
+                for i, node in zip(members, cluster):
+                    if node is None:
+                        raise KeyError(self._labels[i])
+                clusters.append(cluster)
+        return clusters
+
+
+def find_node_clusters(
+    nodes: list[dict] | CSRGraph, edges: Iterable[dict] | None = None
+) -> list[list[dict]]:
+    """Find connected components (clusters) in the graph.
+
+    Clusters are ordered by their first declared node and members by first
+    appearance, for both list and ``CSRGraph`` input.
+    """
+    if isinstance(nodes, CSRGraph):
+        return _csr_clusters(nodes)
+
+    # Edges are treated as undirected and only streamed once.
+    components = UnionFind(nodes)
+    components.add_edges(edges)
+    return components.clusters()
+
+
+def _csr_clusters(graph: CSRGraph) -> list[list[dict]]:
+    """Weakly connected components of ``graph``, members in node-id order."""
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    in_indptr, in_indices = graph.in_indptr.tolist(), graph.in_indices.tolist()
+    visited = [False] * graph.num_nodes
     clusters = []
-
-    for node in nodes:
-        node_id = node["id"]
-        if node_id in visited:
+    for start in graph.declared().tolist():
+        if visited[start]:
             continue
-
-        # Start a new cluster
-        cluster = []
-        queue = [node_id]
-        visited.add(node_id)
-
+        visited[start] = True
+        members = []
+        queue = deque([start])
         while queue:
-            current = queue.pop(0)
-            cluster.append(node_map[current])
-
-            for neighbor in adjacency.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            current = queue.popleft()
+            members.append(current)
+            for neighbor in indices[indptr[current] : indptr[current + 1]]:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
                     queue.append(neighbor)
+            for neighbor in in_indices[in_indptr[current] : in_indptr[current + 1]]:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
+                    queue.append(neighbor)
+        # Ids follow first appearance, which is the order UnionFind reports.
+        members.sort()
+        clusters.append([graph.node(i) for i in members])
+    return clusters
 
-        clusters.append(cluster)
 
-    return clusters
+def _brandes_partial(
+    indptr: list[int], indices: list[int], is_target: list[bool], sources: list[int]
+) -> list[float]:
+    """Accumulate Brandes dependencies from ``sources`` over an unweighted CSR graph."""
+    n = len(indptr) - 1
+    betweenness = [0.0] * n
+    for source in sources:
+        order = []
+        preds: list[list[int]] = [[] for _ in range(n)]
+        sigma = [0] * n
+        dist = [-1] * n
+        sigma[source] = 1
+        dist[source] = 0
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            next_dist = dist[v] + 1
+            for w in indices[indptr[v] : indptr[v + 1]]:
+                if dist[w] < 0:
+                    dist[w] = next_dist
+                    queue.append(w)
+                if dist[w] == next_dist:
+                    sigma[w] += sigma[v]
+                    preds[w].append(v)
+        delta = [0.0] * n
+        for w in reversed(order):
+            coeff = (is_target[w] + delta[w]) / sigma[w]
+            for v in preds[w]:
+                delta[v] += sigma[v] * coeff
+            if w != source:
+                betweenness[w] += delta[w]
+    return betweenness
 
 
 def calculate_node_betweenness(
-    nodes: list[str], edges: list[dict[str, str]]
+    nodes: list[str] | CSRGraph,
+    edges: list[dict[str, str]] | None = None,
+    k: int | None = None,
+    seed: int | None = None,
+    workers: int | None = None,
 ) -> dict[str, float]:
-    """Calculate betweenness centrality for each node."""
-    betweenness = {node: 0.0 for node in nodes}
-
-    # For each pair of nodes, find all shortest paths and count paths through each node
-    for source in nodes:
-        for target in nodes:
-            if source == target:
+    """Calculate betweenness centrality for each node.
+
+    Uses Brandes' O(VE) algorithm over directed, unweighted shortest paths
+    between ordered pairs of ``nodes`` (scores are not normalized). With ``k``
+    only ``k`` randomly sampled sources (reproducible via ``seed``) are used
+    and scores are scaled up to estimate the exact values. ``workers > 1``
+    splits the sources across a process pool and sums the partial scores.
+    """
+    if isinstance(nodes, CSRGraph):
+        graph = nodes
+        nodes = graph.labels
+    else:
+        graph = CSRGraph.from_edges(
+            ((edge["source"], edge["target"]) for edge in edges), nodes
+        )
+
+    ids = sorted({graph.index[node] for node in nodes})
+    is_target = [False] * graph.num_nodes
+    for i in ids:
+        is_target[i] = True
+
+    sources = ids
+    scale = 1.0
+    if k is not None and k < len(ids):
+        sources = sorted(random.Random(seed).sample(ids, k))
+        scale = len(ids) / k
+
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    if workers is not None and workers > 1 and len(sources) > 1:
+        chunks = [sources[i::workers] for i in range(workers) if sources[i::workers]]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            partials = pool.map(
+                _brandes_partial,
+                *zip(*((indptr, indices, is_target, chunk) for chunk in chunks)),
+            )
+            scores = [sum(values) for values in zip(*partials)]
+    else:
+        scores = _brandes_partial(indptr, indices, is_target, sources)
+
+    return {node: scores[graph.index[node]] * scale for node in nodes}
+
+
+def _tarjan(indptr: list[int], indices: list[int]) -> tuple[list[list[int]], list[int]]:
+    """Iterative Tarjan SCC over CSR lists.
+
+    Returns ``(components, component_of)`` with components in topological
+    order of the condensation (every edge goes from a lower to a higher or the
+    same component) and members listed in ascending id order.
+    """
+    n = len(indptr) - 1
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: list[int] = []
+    emitted: list[list[int]] = []
+    counter = 0
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+        while work:
+            v, pos = work[-1]
+            if pos < indptr[v + 1]:
+                work[-1] = (v, pos + 1)
+                w = indices[pos]
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
                 continue
-
-            # Find all shortest paths from source to target
-            all_paths = []
-
-            # BFS to find shortest path length
-            queue = [(source, [source])]
-            shortest_length = float("inf")
-
-            while queue:
-                current, path = queue.pop(0)
-
-                # If we've found a path to target
-                if current == target:
-                    all_paths.append(path)
-                    continue
-
-                if len(path) > shortest_length:
-                    continue
-
-                for edge in edges:
-                    if edge["source"] == current and edge["target"] not in path:
-                        new_path = path + [edge["target"]]
-                        queue.append((edge["target"], new_path))
-
-                        if edge["target"] == target:
-                            shortest_length = len(new_path) - 1
-
-            # Count how many shortest paths go through each node
-            for path in all_paths:
-                for node in path[1:-1]:  # Exclude source and target
-                    betweenness[node] += 1.0 / len(all_paths)
-
-    return betweenness
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == order[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                component.sort()
+                emitted.append(component)
+
+    # Tarjan emits sink components first; reverse for a topological order.
+    emitted.reverse()
+    component_of = [0] * n
+    for c, component in enumerate(emitted):
+        for v in component:
+            component_of[v] = c
+    return emitted, component_of
+
+
+def _scc_ids(graph: CSRGraph) -> list[list[int]]:
+    """Strongly connected components of ``graph`` as lists of node ids."""
+    return _tarjan(graph.indptr.tolist(), graph.indices.tolist())[0]
+
+
+def _flow_csr(nodes: list[str], edges: Iterable[dict[str, str]]) -> CSRGraph:
+    """Index ``nodes``/``edges``, ignoring edges whose source is not a declared node."""
+    declared = set(nodes)
+    return CSRGraph.from_edges(
+        ((e["source"], e["target"]) for e in edges if e["source"] in declared), nodes
+    )
 
 
 def find_strongly_connected_components(
-    nodes: list[str], edges: list[dict[str, str]]
+    nodes: list[str] | CSRGraph, edges: list[dict[str, str]] | None = None
 ) -> list[list[str]]:
-    """Find strongly connected components using Kosaraju's algorithm."""
-    # Build adjacency list
-    graph = {}
-    for node in nodes:
-        graph[node] = []
-
-    for edge in edges:
-        src = edge["source"]
-        tgt = edge["target"]
-        if src in graph:
-            graph[src].append(tgt)
-
-    # Find SCCs using a simplified version of Kosaraju's algorithm
-    visited = set()
-    stack = []
-
-    # First DFS to fill the stack
-    def fill_order(node):
-        visited.add(node)
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                fill_order(neighbor)
-        stack.append(node)
-
-    for node in nodes:
-        if node not in visited:
-            fill_order(node)
-
-    # Create reversed graph
-    reversed_graph = {}
-    for node in nodes:
-        reversed_graph[node] = []
-
-    for edge in edges:
-        src = edge["source"]
-        tgt = edge["target"]
-        if tgt in reversed_graph:
-            reversed_graph[tgt].append(src)
-
-    # Second DFS to find SCCs
-    visited = set()
-    sccs = []
-
-    def collect_scc(node, component):
-        visited.add(node)
-        component.append(node)
-        for neighbor in reversed_graph.get(node, []):
-            if neighbor not in visited:
-                collect_scc(neighbor, component)
-
-    while stack:
-        node = stack.pop()
-        if node not in visited:
-            component = []
-            collect_scc(node, component)
-            sccs.append(component)
-
-    return sccs
+    """Find strongly connected components using an iterative Tarjan pass.
+
+    Components are returned in topological order of the condensation DAG,
+    each listing its nodes in input order. Recursion depth is not a limit.
+    """
+    graph = nodes if isinstance(nodes, CSRGraph) else _flow_csr(nodes, edges)
+    labels = graph.labels
+    return [[labels[v] for v in component] for component in _scc_ids(graph)]
+
+
+class Condensation(NamedTuple):
+    """SCC condensation of a directed graph.
+
+    ``components[c]`` lists the node labels of component ``c`` (components are
+    topologically ordered), ``component_of`` maps labels to component ids,
+    ``dag[c]`` lists the components ``c`` has edges into, and ``layers``
+    groups component ids so every edge goes to a strictly later layer
+    (within a layer, components follow the input order of their first node).
+    """
+
+    components: list[list[Hashable]]
+    component_of: dict[Hashable, int]
+    dag: list[list[int]]
+    layers: list[list[int]]
+
+    @property
+    def vertices_layers(self) -> list[list[Hashable]]:
+        """Node labels per layer, in the shape ``sort_chat_inputs_first`` takes."""
+        components = self.components
+        return [[v for c in layer for v in components[c]] for layer in self.layers]
+
+
+def build_condensation(
+    nodes: list[str] | CSRGraph, edges: list[dict[str, str]] | None = None
+) -> Condensation:
+    """Compute SCCs, the condensation DAG and its topological layers in O(V + E).
+
+    A component's layer is the length of the longest condensation path
+    reaching it, so each layer only depends on earlier layers.
+    """
+    graph = nodes if isinstance(nodes, CSRGraph) else _flow_csr(nodes, edges)
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    components, component_of = _tarjan(indptr, indices)
+
+    dag: list[list[int]] = []
+    depth = [0] * len(components)
+    for c, members in enumerate(components):
+        targets = {
+            component_of[w]
+            for v in members
+            for w in indices[indptr[v] : indptr[v + 1]]
+            if component_of[w] != c
+        }
+        next_depth = depth[c] + 1
+        for d in targets:
+            if depth[d] < next_depth:
+                depth[d] = next_depth
+        dag.append(sorted(targets))
+
+    layers: list[list[int]] = [[] for _ in range(max(depth, default=-1) + 1)]
+    for c, d in enumerate(depth):
+        layers[d].append(c)
+    for layer in layers:
+        layer.sort(key=lambda c: components[c][0])
+
+    labels = graph.labels
+    return Condensation(
+        [[labels[v] for v in members] for members in components],
+        {labels[v]: c for v, c in enumerate(component_of)},
+        dag,
+        layers,
+    )
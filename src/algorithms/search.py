@@ -1,7 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, NewType
+import asyncio
+import inspect
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, NamedTuple, NewType, TextIO
 
+from .graph import Condensation
 
 JsonRef = NewType("JsonRef", str)
 
@@ -9,44 +17,210 @@ JsonRef = NewType("JsonRef", str)
 def _get_all_json_refs(item: Any) -> set[JsonRef]:
     """Get all the definitions references from a JSON schema."""
     refs: set[JsonRef] = set()
-    if isinstance(item, dict):
-        for key, value in item.items():
-            if key == "$ref" and isinstance(value, str):
-                # the isinstance check ensures that '$ref' isn't the name of a property, etc.
-                refs.add(JsonRef(value))
-            elif isinstance(value, dict):
-                refs.update(_get_all_json_refs(value))
-            elif isinstance(value, list):
-                for item in value:
-                    refs.update(_get_all_json_refs(item))
-    elif isinstance(item, list):
-        for item in item:
-            refs.update(_get_all_json_refs(item))
+    stack = [item]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for key, value in current.items():
+                if key == "$ref" and isinstance(value, str):
+                    # the isinstance check ensures that '$ref' isn't the name of a property, etc.
+                    refs.add(JsonRef(value))
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(current, list):
+            stack.extend(value for value in current if isinstance(value, (dict, list)))
     return refs
 
 
+_REF_PATTERN = re.compile(r'"\$ref"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# Matches a suffix of the buffer that could still grow into a full ``_REF_PATTERN`` match.
+_PARTIAL_REF_PATTERN = re.compile(r'"\$ref"\s*(?::\s*(?:"(?:[^"\\]|\\.)*\\?)?)?')
+
+
+def iter_json_refs_from_file(
+    file: str | os.PathLike | TextIO, chunk_size: int = 1 << 20
+) -> Iterator[JsonRef]:
+    """Yield every ``"$ref": "<string>"`` in a JSON file, reading it in chunks.
+
+    Only a chunk plus a possibly incomplete trailing match is held in memory.
+    In valid JSON a quoted ``"$ref"`` followed by ``:`` can only be an object
+    key, so this finds the same refs as :func:`_get_all_json_refs` on the
+    parsed document (duplicates are yielded once per occurrence).
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, encoding="utf-8") as handle:
+            yield from iter_json_refs_from_file(handle, chunk_size)
+        return
+
+    buffer = ""
+    while True:
+        chunk = file.read(chunk_size)
+        buffer += chunk
+        consumed = 0
+        for match in _REF_PATTERN.finditer(buffer):
+            yield JsonRef(json.loads(f'"{match.group(1)}"'))
+            consumed = match.end()
+        if not chunk:
+            return
+        keep = max(consumed, len(buffer) - len('"$ref"'))
+        candidate = buffer.rfind('"$ref"', consumed)
+        if candidate != -1 and _PARTIAL_REF_PATTERN.fullmatch(buffer, candidate):
+            keep = candidate
+        buffer = buffer[keep:]
+
+
+class JsonRefGraph:
+    """Dependency graph between the definitions of a JSON schema.
+
+    Maps each definition ref (``#/$defs/Name`` or ``#/definitions/Name``) to
+    the refs used directly inside it. :meth:`closure` returns everything a
+    definition pulls in transitively and is cached per definition.
+    """
+
+    def __init__(self, schema: dict):
+        self.edges: dict[JsonRef, frozenset[JsonRef]] = {}
+        for container in ("$defs", "definitions"):
+            for name, definition in schema.get(container, {}).items():
+                ref = JsonRef(f"#/{container}/{name}")
+                self.edges[ref] = frozenset(_get_all_json_refs(definition))
+        self.roots = frozenset(
+            _get_all_json_refs(
+                {k: v for k, v in schema.items() if k not in ("$defs", "definitions")}
+            )
+        )
+        self._closure: dict[JsonRef, frozenset[JsonRef]] = {}
+
+    def refs(self, ref: JsonRef) -> frozenset[JsonRef]:
+        """Refs used directly by the definition ``ref``."""
+        return self.edges.get(ref, frozenset())
+
+    def closure(self, ref: JsonRef) -> frozenset[JsonRef]:
+        """All refs reachable from ``ref`` (``ref`` itself only if it is recursive)."""
+        cached = self._closure.get(ref)
+        if cached is not None:
+            return cached
+        reached: set[JsonRef] = set()
+        stack = list(self.refs(ref))
+        while stack:
+            current = stack.pop()
+            if current in reached:
+                continue
+            reached.add(current)
+            known = self._closure.get(current)
+            if known is not None:
+                reached.update(known)
+            else:
+                stack.extend(self.refs(current))
+        result = self._closure[ref] = frozenset(reached)
+        return result
+
+    def required_definitions(self) -> frozenset[JsonRef]:
+        """Every definition the schema's top level pulls in, directly or not."""
+        needed = set(self.roots)
+        for ref in self.roots:
+            needed.update(self.closure(ref))
+        return frozenset(needed)
+
+
 def sort_chat_inputs_first(self, vertices_layers: list[list[str]]) -> list[list[str]]:
     """Sort vertices to prioritize chat inputs in the first layer."""
-    # First check if any chat inputs have dependencies
-    for layer in vertices_layers:
-        for vertex_id in layer:
-            if "ChatInput" in vertex_id and self.get_predecessors(
-                self.get_vertex(vertex_id)
-            ):
-                return vertices_layers
-
-    # If no chat inputs have dependencies, move them to first layer
+    # Collect chat inputs in one pass, bailing out if any has dependencies
     chat_inputs_first = []
     for layer in vertices_layers:
-        layer_chat_inputs_first = [
-            vertex_id for vertex_id in layer if "ChatInput" in vertex_id
-        ]
-        chat_inputs_first.extend(layer_chat_inputs_first)
-        for vertex_id in layer_chat_inputs_first:
-            # Remove the ChatInput from the layer
-            layer.remove(vertex_id)
+        for vertex_id in layer:
+            if "ChatInput" in vertex_id:
+                if self.get_predecessors(self.get_vertex(vertex_id)):
+                    return vertices_layers
+                chat_inputs_first.append(vertex_id)
 
     if not chat_inputs_first:
         return vertices_layers
 
+    # Move them to the first layer, removing them from their original layers
+    for layer in vertices_layers:
+        layer[:] = [vertex_id for vertex_id in layer if "ChatInput" not in vertex_id]
+
     return [chat_inputs_first, *vertices_layers]
+
+
+class LayerRunReport(NamedTuple):
+    """Results of :func:`run_layers`: per-vertex results and per-layer wall times."""
+
+    results: dict[str, Any]
+    layer_seconds: list[float]
+
+    @property
+    def critical_path_seconds(self) -> float:
+        """Total latency, i.e. the sum of the slowest vertex of every layer."""
+        return sum(self.layer_seconds)
+
+
+def _execution_layers(
+    vertices_layers: list[list[str]] | Condensation,
+) -> list[list[str]]:
+    """Normalize layers and order each so chat inputs are submitted first."""
+    if isinstance(vertices_layers, Condensation):
+        vertices_layers = vertices_layers.vertices_layers
+    return [
+        sorted(layer, key=lambda vertex_id: "ChatInput" not in vertex_id)
+        for layer in vertices_layers
+    ]
+
+
+def run_layers(
+    vertices_layers: list[list[str]] | Condensation,
+    func: Callable[[str], Any],
+    executor: str = "thread",
+    max_workers: int | None = None,
+) -> LayerRunReport:
+    """Run ``func(vertex_id)`` layer by layer, with each layer's vertices in parallel.
+
+    ``vertices_layers`` is the output of :func:`sort_chat_inputs_first` (or a
+    :class:`~graph.Condensation` to compute it from a graph). ``executor`` is
+    ``"thread"`` or ``"process"`` (``func`` must then be picklable). A layer
+    starts only after the previous one has finished; the first failure is
+    re-raised once its layer completes.
+    """
+    if executor == "thread":
+        pool_class = ThreadPoolExecutor
+    elif executor == "process":
+        pool_class = ProcessPoolExecutor
+    else:
+        raise ValueError(f"Unsupported executor: {executor}")
+
+    results: dict[str, Any] = {}
+    layer_seconds: list[float] = []
+    with pool_class(max_workers=max_workers) as pool:
+        for layer in _execution_layers(vertices_layers):
+            started = time.perf_counter()
+            futures = [pool.submit(func, vertex_id) for vertex_id in layer]
+            for vertex_id, future in zip(layer, futures):
+                results[vertex_id] = future.result()
+            layer_seconds.append(time.perf_counter() - started)
+    return LayerRunReport(results, layer_seconds)
+
+
+async def run_layers_async(
+    vertices_layers: list[list[str]] | Condensation,
+    func: Callable[[str], Any],
+) -> LayerRunReport:
+    """Asyncio variant of :func:`run_layers`.
+
+    Coroutine functions are awaited concurrently within a layer; plain
+    functions are run in the default thread pool via ``asyncio.to_thread``.
+    """
+    if inspect.iscoroutinefunction(func):
+        call = func
+    else:
+
+        def call(vertex_id: str) -> Any:
+            return asyncio.to_thread(func, vertex_id)
+
+    results: dict[str, Any] = {}
+    layer_seconds: list[float] = []
+    for layer in _execution_layers(vertices_layers):
+        started = time.perf_counter()
+        values = await asyncio.gather(*(call(vertex_id) for vertex_id in layer))
+        results.update(zip(layer, values))
+        layer_seconds.append(time.perf_counter() - started)
+    return LayerRunReport(results, layer_seconds)
@@ -1,6 +1,16 @@
 from __future__ import annotations
 
+import heapq
+import math
+import mmap
+import os
 import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Hashable, Iterable, Iterator
+
+import numpy as np
 
 
 def string_concat(n):
@@ -11,30 +21,396 @@ def string_concat(n):
 
 
 def regex_match(strings: list[str], pattern: str) -> list[str]:
-    matched = []
-    for s in strings:
-        if re.match(pattern, s):
-            matched.append(s)
-    return matched
+    match = re.compile(pattern).match
+    return [s for s in strings if match(s)]
+
+
+_META_CHARS = set("\\.^$*+?{}[]|()")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Literal text every match of ``pattern`` must start with ("" if unknown)."""
+    if "|" in pattern:
+        return ""
+    prefix = []
+    for char in pattern:
+        if char in _META_CHARS:
+            # A quantifier applies to the preceding literal, which is then optional.
+            if char in "*?{" and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return "".join(prefix)
+
+
+class RegexMatcher:
+    """Match strings against many patterns compiled once.
+
+    ``patterns`` is a single pattern, a list (names are list positions) or a
+    ``{name: pattern}`` dict. Like :func:`regex_match` every pattern is
+    anchored at the start of the string, and :meth:`match` returns the name
+    of the first pattern (in the given order) that matches. Patterns are
+    combined into one alternation of named groups when possible; strings that
+    cannot start with any pattern's literal prefix are rejected before the
+    regex engine runs.
+    """
+
+    def __init__(self, patterns: str | list[str] | dict[Hashable, str], flags: int = 0):
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if not isinstance(patterns, dict):
+            patterns = dict(enumerate(patterns))
+        if not patterns:
+            raise ValueError("At least one pattern is required")
+        self.patterns = patterns
+        self.flags = flags
+        self.names = list(patterns)
+
+        self._combined = None
+        # Numbered backreferences and conditionals like ``(?(1)x|y)`` would
+        # point at the wrong group once combined.
+        if len(patterns) > 1 and not any(
+            re.search(r"\\[1-9]|\(\?\(\d+\)", p) for p in patterns.values()
+        ):
+            alternation = "|".join(
+                f"(?P<_p{i}>{pattern})" for i, pattern in enumerate(patterns.values())
+            )
+            try:
+                self._combined = re.compile(alternation, flags)
+            except re.error:
+                pass  # e.g. global inline flags or duplicate group names
+        self._compiled = [re.compile(p, flags) for p in patterns.values()]
+
+        prefixes = tuple(_literal_prefix(p) for p in patterns.values())
+        # Flags (passed in or inline) that change how literal characters are
+        # read make the raw prefix text meaningless.
+        literal_flags = re.IGNORECASE | re.VERBOSE
+        if not all(prefixes) or any(c.flags & literal_flags for c in self._compiled):
+            prefixes = ()
+        self._prefixes = prefixes
+
+    def __getstate__(self) -> dict:
+        return {"patterns": self.patterns, "flags": self.flags}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["patterns"], state["flags"])
+
+    def match(self, s: str) -> Hashable | None:
+        """Name of the first pattern matching at the start of ``s``, or ``None``."""
+        if self._prefixes and not s.startswith(self._prefixes):
+            return None
+        if self._combined is not None:
+            found = self._combined.match(s)
+            if found is None:
+                return None
+            return self.names[int(found.lastgroup[2:])]
+        for name, compiled in zip(self.names, self._compiled):
+            if compiled.match(s):
+                return name
+        return None
+
+    def _match_chunk(self, strings: list[str]) -> list[tuple[str, Hashable]]:
+        match = self.match
+        return [(s, name) for s in strings if (name := match(s)) is not None]
+
+    def iter_matches(
+        self,
+        strings: Iterable[str],
+        chunk_size: int = 10_000,
+        workers: int | None = None,
+    ) -> Iterator[tuple[str, Hashable]]:
+        """Lazily yield ``(string, pattern_name)`` for every matching string, in order.
+
+        With ``workers`` > 1, chunks of ``chunk_size`` strings are matched in a
+        process pool with at most ``2 * workers`` chunks in flight.
+        """
+        iterator = iter(strings)
+        chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+        if workers is None or workers <= 1:
+            for chunk in chunks:
+                yield from self._match_chunk(chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(self._match_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def filter(self, strings: Iterable[str], **kwargs) -> Iterator[str]:
+        """Lazily yield the strings matching any pattern (see :meth:`iter_matches`)."""
+        return (s for s, _ in self.iter_matches(strings, **kwargs))
+
+
+class _AlnumLowerTable(dict):
+    """``str.translate`` table that lowercases alphanumerics and drops the rest.
+
+    Entries are computed on first use, so only code points actually seen are
+    stored instead of a table covering all of Unicode.
+    """
+
+    def __missing__(self, code_point: int) -> str | None:
+        char = chr(code_point)
+        value = char.lower() if char.isalnum() else None
+        self[code_point] = value
+        return value
+
+
+_ALNUM_LOWER = _AlnumLowerTable()
 
 
 def is_palindrome(text: str) -> bool:
-    cleaned_text = "".join(c.lower() for c in text if c.isalnum())
-    for i in range(len(cleaned_text) // 2):
-        if cleaned_text[i] != cleaned_text[len(cleaned_text) - 1 - i]:
-            return False
-    return True
+    cleaned_text = text.translate(_ALNUM_LOWER)
+    return cleaned_text == cleaned_text[::-1]
+
+
+def _batched(texts: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    iterator = iter(texts)
+    return iter(lambda: list(islice(iterator, chunk_size)), [])
+
+
+def _palindrome_chunk(texts: list[str]) -> list[bool]:
+    table = _ALNUM_LOWER
+    return [(cleaned := text.translate(table)) == cleaned[::-1] for text in texts]
+
+
+def _word_count_chunk(texts: list[str]) -> Counter:
+    # One lower()/split() over the joined chunk runs in C instead of per record.
+    return Counter("\n".join(texts).lower().split())
+
+
+def _map_chunks(func, texts: Iterable[str], chunk_size: int, workers: int | None):
+    """Apply ``func`` to chunks of ``texts``, optionally in a process pool.
+
+    The pool gets at most ``2 * workers`` chunks at a time, so a large or
+    lazy input is not materialized up front.
+    """
+    if hasattr(texts, "tolist"):
+        texts = texts.tolist()  # numpy arrays and pandas Series
+    chunks = _batched(texts, chunk_size)
+    if workers is None or workers <= 1:
+        yield from map(func, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def is_palindrome_batch(
+    texts: Iterable[str], chunk_size: int = 100_000, workers: int | None = None
+) -> np.ndarray:
+    """Vectorized :func:`is_palindrome` over a numpy array, Series or iterable.
+
+    Returns a boolean array in input order; chunks of ``chunk_size`` texts
+    are processed in a process pool when ``workers`` > 1.
+    """
+    flags: list[bool] = []
+    for chunk in _map_chunks(_palindrome_chunk, texts, chunk_size, workers):
+        flags.extend(chunk)
+    return np.array(flags, dtype=bool)
+
+
+def word_frequency_batch(
+    texts: Iterable[str], chunk_size: int = 100_000, workers: int | None = None
+) -> dict[str, int]:
+    """Word counts over many records, as :func:`word_frequency` of their concatenation."""
+    frequency: Counter = Counter()
+    for partial in _map_chunks(_word_count_chunk, texts, chunk_size, workers):
+        frequency.update(partial)
+    return dict(frequency)
+
+
+def longest_palindromic_substring(text: str) -> str:
+    """Longest palindromic substring of ``text`` (compared as-is) via Manacher, O(n)."""
+    if not text:
+        return ""
+    # Interleave separators so even and odd palindromes are handled alike;
+    # separators only ever get compared with other separators.
+    chars = "\x00" + "\x00".join(text) + "\x00"
+    n = len(chars)
+    radius = [0] * n
+    center = right = 0
+    for i in range(n):
+        if i < right:
+            radius[i] = min(right - i, radius[2 * center - i])
+        r = radius[i]
+        while i - r > 0 and i + r < n - 1 and chars[i + r + 1] == chars[i - r - 1]:
+            r += 1
+        radius[i] = r
+        if i + radius[i] > right:
+            center, right = i, i + radius[i]
+    best = max(range(n), key=radius.__getitem__)
+    start = (best - radius[best]) // 2
+    return text[start : start + radius[best]]
 
 
 def word_frequency(text: str) -> dict[str, int]:
-    words = text.lower().split()
-    frequency = {}
-    for word in words:
-        if word in frequency:
-            frequency[word] += 1
+    return dict(Counter(text.lower().split()))
+
+
+_WHITESPACE_BYTES = b" \t\n\r\x0b\x0c"
+
+
+def _chunk_bounds(path: str | os.PathLike, chunk_size: int) -> list[tuple[int, int]]:
+    """Split a file into byte ranges of about ``chunk_size`` that end on ASCII whitespace.
+
+    ASCII whitespace bytes never occur inside a multi-byte UTF-8 sequence, so
+    every range decodes on its own and no word straddles two ranges.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = []
+    with (
+        open(path, "rb") as handle,
+        mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view,
+    ):
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            while end < size and view[end] not in _WHITESPACE_BYTES:
+                end += 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def _count_range(path: str | os.PathLike, start: int, end: int) -> Counter:
+    with (
+        open(path, "rb") as handle,
+        mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view,
+    ):
+        return Counter(view[start:end].decode("utf-8").lower().split())
+
+
+def iter_text_chunks(
+    path: str | os.PathLike, chunk_size: int = 1 << 24
+) -> Iterator[str]:
+    """Yield a UTF-8 file as decoded chunks that never split a word."""
+    with open(path, "rb") as handle:
+        for start, end in _chunk_bounds(path, chunk_size):
+            yield handle.read(end - start).decode("utf-8")
+
+
+def _stream_words(chunks: Iterable[str]) -> Iterator[str]:
+    """Lowercased words of the concatenated ``chunks``, joining words cut at edges."""
+    carry = ""
+    for chunk in chunks:
+        chunk = carry + chunk
+        words = chunk.split()
+        carry = ""
+        if words and not chunk[-1].isspace():
+            carry = words.pop()
+        for word in words:
+            yield word.lower()
+    if carry:
+        yield carry.lower()
+
+
+def word_frequency_stream(chunks: Iterable[str]) -> dict[str, int]:
+    """Like :func:`word_frequency` over the concatenation of ``chunks``.
+
+    A word cut by a chunk edge is carried over and joined with the next chunk.
+    """
+    return dict(Counter(_stream_words(chunks)))
+
+
+def word_frequency_file(
+    path: str | os.PathLike, chunk_size: int = 1 << 24, workers: int | None = None
+) -> dict[str, int]:
+    """Count words of a UTF-8 file by memory-mapping it chunk by chunk.
+
+    With ``workers`` > 1 the chunks are counted in a process pool and the
+    partial ``Counter`` objects are merged.
+    """
+    bounds = _chunk_bounds(path, chunk_size)
+    frequency: Counter = Counter()
+    if workers is None or workers <= 1 or len(bounds) < 2:
+        for start, end in bounds:
+            frequency.update(_count_range(path, start, end))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(
+                _count_range,
+                [path] * len(bounds),
+                *zip(*bounds),
+            ):
+                frequency.update(partial)
+    return dict(frequency)
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter counter holding at most ``capacity`` words.
+
+    Counts are overestimates by at most :meth:`error`; any word occurring
+    more than ``total / capacity`` times is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        # Lazy min-heap of (count, word); stale entries are skipped on pop.
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, word: str, count: int = 1) -> None:
+        self.total += count
+        counts = self._counts
+        if word in counts:
+            counts[word] += count
+        elif len(counts) < self.capacity:
+            counts[word] = count
+            self._errors[word] = 0
         else:
-            frequency[word] = 1
-    return frequency
+            heap = self._heap
+            while True:
+                smallest, victim = heapq.heappop(heap)
+                if counts.get(victim) == smallest:
+                    break
+            del counts[victim]
+            del self._errors[victim]
+            counts[word] = smallest + count
+            self._errors[word] = smallest
+        heapq.heappush(self._heap, (counts[word], word))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, w) for w, c in counts.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, words: Iterable[str]) -> None:
+        for word in words:
+            self.add(word)
+
+    def error(self, word: str) -> int:
+        """Maximum overestimate of ``word``'s count."""
+        return self._errors.get(word, 0)
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        """The ``k`` words with the highest estimated counts."""
+        return heapq.nlargest(k, self._counts.items(), key=lambda item: item[1])
+
+
+def top_k_words(
+    chunks: Iterable[str], k: int, capacity: int | None = None
+) -> list[tuple[str, int]]:
+    """Approximate top-``k`` words of a text stream in bounded memory.
+
+    ``chunks`` can be any iterable of text pieces (e.g. :func:`iter_text_chunks`);
+    at most ``capacity`` (default ``10 * k``) distinct words are tracked.
+    """
+    counter = SpaceSaving(capacity or 10 * k)
+    counter.update(_stream_words(chunks))
+    return counter.top(k)
 
 
 def find_common_tags(articles: list[dict[str, list[str]]]) -> set[str]:
@@ -47,3 +423,143 @@ def find_common_tags(articles: list[dict[str, list[str]]]) -> set[str]:
         if not common_tags:
             break
     return common_tags
+
+
+# TagIndex bitmaps are split into chunks of 2**16 ids (as in Roaring bitmaps),
+# so a rare tag only stores the chunks it occurs in.
+_TAG_CHUNK_BITS = 16
+_TAG_CHUNK_MASK = (1 << _TAG_CHUNK_BITS) - 1
+
+
+def _chunked_bitmap(ids: Iterable[int]) -> dict[int, int]:
+    """Build a ``{chunk: int bitset}`` bitmap in one allocation per chunk."""
+    ids = np.fromiter(ids, dtype=np.int64)
+    if not len(ids):
+        return {}
+    if not (ids[1:] > ids[:-1]).all():
+        # Queued postings arrive sorted; arbitrary query subsets may not.
+        ids = np.unique(ids)
+    chunks = ids >> _TAG_CHUNK_BITS
+    bounds = np.flatnonzero(np.diff(chunks)) + 1
+    bitmap = {}
+    for chunk_ids in np.split(ids, bounds):
+        lows = chunk_ids & _TAG_CHUNK_MASK
+        bits = np.zeros(int(lows[-1]) + 1, dtype=bool)
+        bits[lows] = True
+        bitmap[int(chunk_ids[0] >> _TAG_CHUNK_BITS)] = int.from_bytes(
+            np.packbits(bits, bitorder="little").tobytes(), "little"
+        )
+    return bitmap
+
+
+class TagIndex:
+    """Inverted index from tag to a bitmap of article ids for fast subset queries.
+
+    Each posting list is a chunked bitmap: a dict from ``id >> 16`` to a
+    Python ``int`` bitset of that chunk's ids, so intersections are ``&`` per
+    shared chunk and counts are ``int.bit_count``. :meth:`add` only queues ids
+    per tag; the bitmaps are built in bulk before the next query, which keeps
+    indexing linear in the number of tags. Articles get integer ids from
+    :meth:`add`; ids of removed articles are not reused.
+    """
+
+    def __init__(self, articles: Iterable[dict[str, list[str]]] = ()):
+        self._postings: dict[str, dict[int, int]] = {}
+        self._pending: dict[str, list[int]] = {}
+        self._tags: dict[int, frozenset[str]] = {}
+        self._next_id = 0
+        for article in articles:
+            self.add(article)
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def add(self, article: dict[str, list[str]]) -> int:
+        """Index ``article`` and return its id."""
+        article_id = self._next_id
+        self._next_id += 1
+        tags = frozenset(article.get("tags", []))
+        self._tags[article_id] = tags
+        pending = self._pending
+        for tag in tags:
+            pending.setdefault(tag, []).append(article_id)
+        return article_id
+
+    def _flush(self) -> None:
+        """Fold queued ids into the posting bitmaps."""
+        for tag, ids in self._pending.items():
+            bitmap = self._postings.setdefault(tag, {})
+            for chunk, bits in _chunked_bitmap(ids).items():
+                bitmap[chunk] = bitmap.get(chunk, 0) | bits
+        self._pending.clear()
+
+    def remove(self, article_id: int) -> None:
+        self._flush()
+        tags = self._tags.pop(article_id)
+        chunk = article_id >> _TAG_CHUNK_BITS
+        mask = ~(1 << (article_id & _TAG_CHUNK_MASK))
+        for tag in tags:
+            bitmap = self._postings[tag]
+            remaining = bitmap[chunk] & mask
+            if remaining:
+                bitmap[chunk] = remaining
+            else:
+                del bitmap[chunk]
+                if not bitmap:
+                    del self._postings[tag]
+
+    def _subset(
+        self, article_ids: Iterable[int] | None
+    ) -> tuple[list[int], dict[int, int]]:
+        """Ids of the queried articles and their bitmap (all articles if ``None``)."""
+        self._flush()
+        ids = list(self._tags) if article_ids is None else list(article_ids)
+        for article_id in ids:
+            if article_id not in self._tags:
+                raise KeyError(article_id)
+        return ids, _chunked_bitmap(ids)
+
+    def tag_count(self, tag: str) -> int:
+        """Number of indexed articles carrying ``tag``."""
+        self._flush()
+        return sum(bits.bit_count() for bits in self._postings.get(tag, {}).values())
+
+    def common_tags(self, article_ids: Iterable[int] | None = None) -> set[str]:
+        """Tags shared by every article in the subset, like :func:`find_common_tags`."""
+        ids, mask = self._subset(article_ids)
+        if not ids:
+            return set()
+        postings = self._postings
+        # Only the first article's tags can be common to the whole subset.
+        return {
+            tag
+            for tag in self._tags[ids[0]]
+            if all(
+                postings[tag].get(chunk, 0) & bits == bits
+                for chunk, bits in mask.items()
+            )
+        }
+
+    def frequent_tags(
+        self, article_ids: Iterable[int] | None = None, min_fraction: float = 0.5
+    ) -> dict[str, int]:
+        """Tags on at least ``min_fraction`` of the subset, mapped to their counts."""
+        ids, mask = self._subset(article_ids)
+        if not ids:
+            return {}
+        subset_size = sum(bits.bit_count() for bits in mask.values())
+        threshold = max(1, math.ceil(min_fraction * subset_size - 1e-9))
+        candidates: set[str] = set()
+        for article_id in ids:
+            candidates.update(self._tags[article_id])
+        postings = self._postings
+        result = {}
+        for tag in candidates:
+            bitmap = postings[tag]
+            count = sum(
+                (bitmap.get(chunk, 0) & bits).bit_count()
+                for chunk, bits in mask.items()
+            )
+            if count >= threshold:
+                result[tag] = count
+        return result
@@ -0,0 +1,220 @@
+"""Factorized hash aggregation shared by the groupby and pivot helpers."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ("sum", "count", "mean", "min", "max", "var")
+
+
+def factorize_keys(
+    df: pd.DataFrame, by: str | list[str]
+) -> tuple[np.ndarray, list[Any]]:
+    """Map each row to a dense group code, in order of first appearance.
+
+    Returns ``(codes, keys)`` where ``keys[code]`` is the group value (a tuple
+    when ``by`` is a list). Missing values form their own group.
+    """
+    if isinstance(by, str):
+        codes, uniques = pd.factorize(df[by], use_na_sentinel=False)
+        return codes.astype(np.int64, copy=False), list(uniques)
+
+    parts = [pd.factorize(df[column], use_na_sentinel=False) for column in by]
+    dims = tuple(max(len(uniques), 1) for _, uniques in parts)
+    combined = np.ravel_multi_index([codes for codes, _ in parts], dims)
+    codes, first_combined = pd.factorize(combined)
+    positions = np.unravel_index(np.asarray(first_combined), dims)
+    key_columns = [
+        uniques.take(position).tolist()
+        for (_, uniques), position in zip(parts, positions)
+    ]
+    return codes.astype(np.int64, copy=False), list(zip(*key_columns))
+
+
+# Per-group moments each aggregation needs; "count" is answered from the group sizes.
+_MOMENTS = {
+    "sum": ("sum",),
+    "count": (),
+    "mean": ("sum",),
+    "min": ("min",),
+    "max": ("max",),
+    "var": ("sum", "m2"),
+}
+
+
+class GroupedStats:
+    """Per-group sizes plus the sum, min, max and M2 moments that were asked for.
+
+    Built in one vectorized pass per column with ``np.bincount`` and
+    ``ufunc.at``; only the moments the requested aggregations need are
+    computed, and columns that only need ``count`` are never converted to
+    numbers. Instances built from different chunks of a frame can be combined
+    with :meth:`merge` (variance uses Chan's parallel update), so the same
+    core works in memory or chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        keys: list[Any],
+        count: np.ndarray,
+        stats: dict[str, dict[str, np.ndarray]],
+    ):
+        self.keys = keys
+        self.count = count
+        self.stats = stats
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, by: str | list[str], aggs: dict[str, Iterable[str]]
+    ) -> GroupedStats:
+        """Aggregate ``df`` grouped by ``by``; ``aggs`` maps columns to aggregations."""
+        codes, keys = factorize_keys(df, by)
+        n_groups = len(keys)
+        count = np.bincount(codes, minlength=n_groups)
+        stats = {}
+        for column, names in aggs.items():
+            moments = {moment for name in names for moment in _MOMENTS[name]}
+            stats[column] = {}
+            if not moments:
+                continue
+            data = df[column].to_numpy()
+            numeric = data.astype(np.float64)
+            if "sum" in moments:
+                if data.dtype.kind in "biu":
+                    # Keep integer sums exact (and integer-typed) instead of float64.
+                    total = np.zeros(n_groups, dtype=np.int64)
+                    np.add.at(total, codes, data)
+                else:
+                    total = np.bincount(codes, weights=numeric, minlength=n_groups)
+                stats[column]["sum"] = total
+            with np.errstate(invalid="ignore"):
+                if "min" in moments:
+                    lowest = np.full(n_groups, np.inf)
+                    np.minimum.at(lowest, codes, numeric)
+                    stats[column]["min"] = lowest
+                if "max" in moments:
+                    highest = np.full(n_groups, -np.inf)
+                    np.maximum.at(highest, codes, numeric)
+                    stats[column]["max"] = highest
+            if "m2" in moments:
+                deviations = numeric - (total / count)[codes]
+                stats[column]["m2"] = np.bincount(
+                    codes, weights=deviations * deviations, minlength=n_groups
+                )
+        return cls(keys, count, stats)
+
+    def merge(self, other: GroupedStats) -> GroupedStats:
+        """Combine with aggregates of other rows (same columns and moments)."""
+        positions = {key: i for i, key in enumerate(self.keys)}
+        keys = list(self.keys)
+        mapping = np.empty(len(other.keys), dtype=np.int64)
+        for i, key in enumerate(other.keys):
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = len(keys)
+                keys.append(key)
+            mapping[i] = position
+
+        n_groups = len(keys)
+
+        def widen(array: np.ndarray, fill: Any) -> np.ndarray:
+            wide = np.full(n_groups, fill, dtype=array.dtype)
+            wide[: len(array)] = array
+            return wide
+
+        def scatter(array: np.ndarray) -> np.ndarray:
+            wide = np.zeros(n_groups, dtype=array.dtype)
+            wide[mapping] = array
+            return wide
+
+        count_a = widen(self.count, 0)
+        count_b = scatter(other.count)
+        count = count_a + count_b
+
+        stats = {}
+        for column, mine in self.stats.items():
+            theirs = other.stats[column]
+            merged = {}
+            if "sum" in mine:
+                merged["sum"] = widen(mine["sum"], 0)
+                np.add.at(merged["sum"], mapping, theirs["sum"])
+            with np.errstate(invalid="ignore"):
+                if "min" in mine:
+                    merged["min"] = widen(mine["min"], np.inf)
+                    np.minimum.at(merged["min"], mapping, theirs["min"])
+                if "max" in mine:
+                    merged["max"] = widen(mine["max"], -np.inf)
+                    np.maximum.at(merged["max"], mapping, theirs["max"])
+            if "m2" in mine:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    mean_a = widen(mine["sum"] / self.count, 0.0)
+                    mean_b = scatter(theirs["sum"] / other.count)
+                    delta = mean_b - mean_a
+                    m2 = widen(mine["m2"], 0.0) + scatter(theirs["m2"])
+                    merged["m2"] = np.where(
+                        (count_a == 0) | (count_b == 0),
+                        m2,
+                        m2 + delta * delta * count_a * count_b / count,
+                    )
+            stats[column] = merged
+        return GroupedStats(keys, count, stats)
+
+    def result(self, column: str, agg: str, ddof: int = 1) -> np.ndarray:
+        """Values of ``agg`` for ``column``, aligned with :attr:`keys`.
+
+        ``count`` is the number of rows in each group, missing values included.
+        """
+        if agg == "count":
+            return self.count
+        stats = self.stats[column]
+        if agg in ("sum", "min", "max"):
+            return stats[agg]
+        if agg == "mean":
+            return stats["sum"] / self.count
+        if agg == "var":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(
+                    self.count > ddof, stats["m2"] / (self.count - ddof), np.nan
+                )
+        raise ValueError(f"Unsupported aggregation function: {agg}")
+
+
+def group_aggregate(
+    df: pd.DataFrame,
+    by: str | list[str],
+    aggs: dict[str, Iterable[str]],
+    chunk_rows: int | None = None,
+) -> dict[Any, dict[tuple[str, str], Any]]:
+    """Aggregate several value columns per group in one pass.
+
+    ``aggs`` maps value columns to aggregation names from :data:`AGGREGATIONS`;
+    the result maps each group key (in order of first appearance) to
+    ``{(column, agg): value}``. ``chunk_rows`` aggregates the frame in row
+    blocks and merges the partial aggregates.
+    """
+    aggs = {column: list(names) for column, names in aggs.items()}
+    for names in aggs.values():
+        for name in names:
+            if name not in AGGREGATIONS:
+                raise ValueError(f"Unsupported aggregation function: {name}")
+
+    stats = None
+    step = chunk_rows or max(len(df), 1)
+    for start in range(0, len(df), step):
+        partial = GroupedStats.from_frame(df.iloc[start : start + step], by, aggs)
+        stats = partial if stats is None else stats.merge(partial)
+    if stats is None:
+        return {}
+
+    columns = {
+        (column, name): stats.result(column, name).tolist()
+        for column, names in aggs.items()
+        for name in names
+    }
+    return {
+        key: {label: values[i] for label, values in columns.items()}
+        for i, key in enumerate(stats.keys)
+    }
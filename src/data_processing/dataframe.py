@@ -1,60 +1,165 @@
-from typing import List, Callable, Any
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Callable, Any, Iterable, Optional
 
 import numpy as np
 import pandas as pd
 
+from .aggregation import GroupedStats
+from .dedup import duplicated
+from .join import hash_join
+from .sorting import sort_indices
+
+
+class Predicate(ABC):
+    """Boolean row condition evaluated as a vectorized mask over column arrays.
+
+    Build predicates with :func:`col` and combine them with ``&``, ``|`` and
+    ``~``, e.g. ``(col("a") >= 1) & col("b").isin(["x", "y"]) & ~col("c").isna()``.
+    """
+
+    @abstractmethod
+    def columns(self) -> set[str]:
+        """Names of the columns the predicate reads."""
+
+    @abstractmethod
+    def evaluate(
+        self, arrays: dict[str, np.ndarray], start: int, stop: int
+    ) -> np.ndarray:
+        """Mask for rows ``start:stop`` given full column ``arrays``."""
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return _Combine(np.logical_and, self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return _Combine(np.logical_or, self, other)
+
+    def __invert__(self) -> "Predicate":
+        return _Not(self)
+
+
+class _Combine(Predicate):
+    def __init__(self, op: Callable, left: Predicate, right: Predicate):
+        self.op, self.left, self.right = op, left, right
+
+    def columns(self) -> set[str]:
+        return self.left.columns() | self.right.columns()
+
+    def evaluate(self, arrays, start, stop):
+        return self.op(
+            self.left.evaluate(arrays, start, stop),
+            self.right.evaluate(arrays, start, stop),
+        )
+
+
+class _Not(Predicate):
+    def __init__(self, inner: Predicate):
+        self.inner = inner
+
+    def columns(self) -> set[str]:
+        return self.inner.columns()
+
+    def evaluate(self, arrays, start, stop):
+        return ~self.inner.evaluate(arrays, start, stop)
+
+
+class _ColumnTest(Predicate):
+    def __init__(self, column: str, test: Callable[[np.ndarray], Any]):
+        self.column, self.test = column, test
+
+    def columns(self) -> set[str]:
+        return {self.column}
+
+    def evaluate(self, arrays, start, stop):
+        return np.asarray(self.test(arrays[self.column][start:stop]), dtype=bool)
+
+
+class col:
+    """Reference to a DataFrame column for building a :class:`Predicate`."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _test(self, test: Callable[[np.ndarray], Any]) -> Predicate:
+        return _ColumnTest(self.name, test)
+
+    def __eq__(self, value: Any) -> Predicate:  # type: ignore[override]
+        return self._test(lambda values: values == value)
+
+    def __ne__(self, value: Any) -> Predicate:  # type: ignore[override]
+        return self._test(lambda values: values != value)
+
+    def __lt__(self, value: Any) -> Predicate:
+        return self._test(lambda values: values < value)
+
+    def __le__(self, value: Any) -> Predicate:
+        return self._test(lambda values: values <= value)
+
+    def __gt__(self, value: Any) -> Predicate:
+        return self._test(lambda values: values > value)
+
+    def __ge__(self, value: Any) -> Predicate:
+        return self._test(lambda values: values >= value)
+
+    __hash__ = None
+
+    def between(self, low: Any, high: Any, inclusive: str = "both") -> Predicate:
+        """``low <= x <= high``; ``inclusive`` is "both", "left", "right" or "neither"."""
+        if inclusive not in ("both", "left", "right", "neither"):
+            raise ValueError(f"Unsupported inclusive: {inclusive}")
+        lower = np.greater_equal if inclusive in ("both", "left") else np.greater
+        upper = np.less_equal if inclusive in ("both", "right") else np.less
+        return self._test(lambda values: lower(values, low) & upper(values, high))
+
+    def isin(self, values: Iterable[Any]) -> Predicate:
+        options = list(values)
+        return self._test(lambda column: pd.Series(column, copy=False).isin(options))
+
+    def isna(self) -> Predicate:
+        return self._test(pd.isna)
+
+    def notna(self) -> Predicate:
+        return self._test(pd.notna)
+
+
+def filter_rows(
+    df: pd.DataFrame, predicate: Predicate, chunk_rows: Optional[int] = None
+) -> pd.DataFrame:
+    """Rows of ``df`` where ``predicate`` holds, with a fresh ``RangeIndex``.
+
+    ``chunk_rows`` bounds the size of the temporary arrays built while the
+    mask is evaluated, which keeps very large frames cache- and memory-friendly.
+    """
+    n = len(df)
+    arrays = {name: df[name].to_numpy() for name in predicate.columns()}
+    if chunk_rows is None or chunk_rows >= n:
+        mask = predicate.evaluate(arrays, 0, n)
+    else:
+        mask = np.empty(n, dtype=bool)
+        for start in range(0, n, chunk_rows):
+            stop = min(start + chunk_rows, n)
+            mask[start:stop] = predicate.evaluate(arrays, start, stop)
+    return df.iloc[np.flatnonzero(mask)].reset_index(drop=True)
+
 
 def dataframe_filter(df: pd.DataFrame, column: str, value: Any) -> pd.DataFrame:
-    indices = []
-    for i in range(len(df)):
-        if df.iloc[i][column] == value:
-            indices.append(i)
-    return df.iloc[indices].reset_index(drop=True)
+    return filter_rows(df, col(column) == value)
 
 
 def groupby_mean(df: pd.DataFrame, group_col: str, value_col: str) -> dict[Any, float]:
-    sums = {}
-    counts = {}
-    for i in range(len(df)):
-        group = df.iloc[i][group_col]
-        value = df.iloc[i][value_col]
-        if group in sums:
-            sums[group] += value
-            counts[group] += 1
-        else:
-            sums[group] = value
-            counts[group] = 1
-    result = {}
-    for group in sums:
-        result[group] = sums[group] / counts[group]
-    return result
+    stats = GroupedStats.from_frame(df, group_col, {value_col: ["mean"]})
+    return dict(zip(stats.keys, stats.result(value_col, "mean").tolist()))
 
 
 def dataframe_merge(
-    left: pd.DataFrame, right: pd.DataFrame, left_on: str, right_on: str
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_on: str | List[str],
+    right_on: str | List[str],
+    how: str = "inner",
 ) -> pd.DataFrame:
-    result_data = []
-    left_cols = list(left.columns)
-    right_cols = [col for col in right.columns if col != right_on]
-    right_dict = {}
-    for i in range(len(right)):
-        key = right.iloc[i][right_on]
-        if key not in right_dict:
-            right_dict[key] = []
-        right_dict[key].append(i)
-    for i in range(len(left)):
-        left_row = left.iloc[i]
-        key = left_row[left_on]
-        if key in right_dict:
-            for right_idx in right_dict[key]:
-                right_row = right.iloc[right_idx]
-                new_row = {}
-                for col in left_cols:
-                    new_row[col] = left_row[col]
-                for col in right_cols:
-                    new_row[col] = right_row[col]
-                result_data.append(new_row)
-    return pd.DataFrame(result_data)
+    return hash_join(left, right, left_on, right_on, how=how)
 
 
 def apply_function(df: pd.DataFrame, column: str, func: Callable) -> List[Any]:
@@ -74,29 +179,16 @@ def fillna(df: pd.DataFrame, column: str, value: Any) -> pd.DataFrame:
 
 
 def drop_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFrame:
-    if subset is None:
-        subset = df.columns.tolist()
-    seen = set()
-    keep_indices = []
-    for i in range(len(df)):
-        values = tuple(df.iloc[i][col] for col in subset)
-        if values not in seen:
-            seen.add(values)
-            keep_indices.append(i)
-    return df.iloc[keep_indices].reset_index(drop=True)
+    return df[~duplicated(df, subset)].reset_index(drop=True)
 
 
-def sort_values(df: pd.DataFrame, by: str, ascending: bool = True) -> pd.DataFrame:
-    indices = list(range(len(df)))
-    for i in range(len(df)):
-        for j in range(0, len(df) - i - 1):
-            if ascending:
-                condition = df.iloc[indices[j]][by] > df.iloc[indices[j + 1]][by]
-            else:
-                condition = df.iloc[indices[j]][by] < df.iloc[indices[j + 1]][by]
-            if condition:
-                indices[j], indices[j + 1] = indices[j + 1], indices[j]
-    return df.iloc[indices].reset_index(drop=True)
+def sort_values(
+    df: pd.DataFrame,
+    by: str | List[str],
+    ascending: bool | List[bool] = True,
+    na_position: str | List[str] = "last",
+) -> pd.DataFrame:
+    return df.iloc[sort_indices(df, by, ascending, na_position)].reset_index(drop=True)
 
 
 def reindex(df: pd.DataFrame, new_index: List[Any]) -> pd.DataFrame:
@@ -0,0 +1,218 @@
+"""Row deduplication by vectorized 64-bit row hashes.
+
+:func:`duplicated` hashes whole rows with ``pd.util.hash_pandas_object`` and
+only compares values for rows whose hash was seen before, so memory stays at
+one integer per row. Collisions are resolved exactly. For data arriving in
+chunks, :class:`StreamingDeduplicator` remembers a bounded number of rows and
+:class:`BloomDeduplicator` trades exactness for a fixed-size Bloom filter.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Second key for the independent hash used by the Bloom filter's double hashing.
+_SECOND_HASH_KEY = "f3a9c1e07b2d4658"
+
+
+def hash_rows(frame: pd.DataFrame, hash_key: Optional[str] = None) -> np.ndarray:
+    """64-bit hash per row; equal rows hash alike even across chunks.
+
+    Numeric columns are hashed as float64 so that ``1`` and ``1.0`` (and
+    ``0.0`` and ``-0.0``) agree whatever dtype each chunk was read with.
+    """
+    normalized = {}
+    for position in range(frame.shape[1]):
+        column = frame.iloc[:, position]
+        if column.dtype.kind in "biuf":
+            column = column.astype(np.float64) + 0.0
+        normalized[position] = column.reset_index(drop=True)
+    kwargs = {} if hash_key is None else {"hash_key": hash_key}
+    return pd.util.hash_pandas_object(
+        pd.DataFrame(normalized), index=False, **kwargs
+    ).to_numpy()
+
+
+def _rows_equal(
+    frame: pd.DataFrame, rows: np.ndarray, others: np.ndarray
+) -> np.ndarray:
+    """Whether ``frame`` rows ``rows[i]`` and ``others[i]`` hold equal values."""
+    equal = np.ones(len(rows), dtype=bool)
+    for position in range(frame.shape[1]):
+        values = frame.iloc[:, position].to_numpy()
+        a, b = values[rows], values[others]
+        same = np.asarray(a == b, dtype=bool)
+        equal &= same | (pd.isna(a) & pd.isna(b))
+    return equal
+
+
+def duplicated(df: pd.DataFrame, subset: Optional[List[str]] = None) -> np.ndarray:
+    """Mask of rows equal (on ``subset``) to an earlier row; nulls compare equal.
+
+    Each row is checked against the first row with the same hash. Hash groups
+    that turn out to hold different values are rare and are re-checked
+    exactly with ``DataFrame.duplicated``.
+    """
+    frame = df if subset is None else df[subset]
+    if len(frame) == 0:
+        return np.zeros(0, dtype=bool)
+    codes, _ = pd.factorize(hash_rows(frame))
+    _, first = np.unique(codes, return_index=True)
+    leaders = first[codes]
+    candidates = np.flatnonzero(leaders != np.arange(len(codes)))
+    same = _rows_equal(frame, candidates, leaders[candidates])
+    mask = np.zeros(len(codes), dtype=bool)
+    mask[candidates[same]] = True
+
+    collided = np.unique(codes[candidates[~same]])
+    if len(collided):
+        rows = np.flatnonzero(np.isin(codes, collided))
+        mask[rows] = frame.iloc[rows].duplicated().to_numpy()
+    return mask
+
+
+class StreamingDeduplicator:
+    """Drops rows already seen in this or earlier chunks.
+
+    Remembers at most ``max_seen`` distinct rows (all of them when ``None``),
+    keyed by row hash and evicted least recently seen first; a duplicate of an
+    evicted row is passed through again. Within that window the result is
+    exact.
+    """
+
+    def __init__(
+        self, subset: Optional[List[str]] = None, max_seen: Optional[int] = None
+    ):
+        if max_seen is not None and max_seen < 1:
+            raise ValueError("max_seen must be positive")
+        self.subset = subset
+        self.max_seen = max_seen
+        self._seen: OrderedDict[int, list[tuple]] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def filter(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        frame = chunk if self.subset is None else chunk[self.subset]
+        keep = ~duplicated(frame)
+        rows = np.flatnonzero(keep)
+        fresh = frame.iloc[rows]
+        records = fresh.astype(object).where(fresh.notna(), None)
+        for row, key, record in zip(
+            rows, hash_rows(fresh).tolist(), records.itertuples(index=False, name=None)
+        ):
+            stored = self._seen.get(key)
+            if stored is None:
+                self._seen[key] = [record]
+            elif record in stored:
+                keep[row] = False
+                self._seen.move_to_end(key)
+                continue
+            else:
+                stored.append(record)
+                self._seen.move_to_end(key)
+            self._size += 1
+        while self.max_seen is not None and self._size > self.max_seen:
+            _, evicted = self._seen.popitem(last=False)
+            self._size -= len(evicted)
+        return chunk[keep].reset_index(drop=True)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over pairs of 64-bit hashes.
+
+    Sized for ``capacity`` items at false-positive rate ``error_rate``
+    (``m = -n ln p / ln² 2`` bits, ``k = m / n ln 2`` probes); the probes
+    are derived from two independent hashes by double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        probes = np.arange(self.hash_count, dtype=np.uint64)
+        return (first[:, None] + probes * second[:, None]) % np.uint64(self.size)
+
+    def contains(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        positions = self._positions(first, second)
+        shifts = (positions & np.uint64(7)).astype(np.uint8)
+        bits = (self._bits[positions >> np.uint64(3)] >> shifts) & 1
+        return bits.all(axis=1)
+
+    def add(self, first: np.ndarray, second: np.ndarray) -> None:
+        positions = self._positions(first, second).ravel()
+        np.bitwise_or.at(
+            self._bits,
+            positions >> np.uint64(3),
+            np.left_shift(1, positions & np.uint64(7)).astype(np.uint8),
+        )
+
+
+class BloomDeduplicator:
+    """Approximate streaming dedup in constant memory.
+
+    Duplicates within a chunk are removed exactly; rows seen in earlier
+    chunks are detected through a :class:`BloomFilter`, so a new row is
+    wrongly dropped with probability about ``error_rate`` once
+    ``expected_rows`` distinct rows have been added.
+    """
+
+    def __init__(
+        self,
+        expected_rows: int,
+        error_rate: float = 0.01,
+        subset: Optional[List[str]] = None,
+    ):
+        self.subset = subset
+        self.bloom = BloomFilter(expected_rows, error_rate)
+
+    def filter(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        frame = chunk if self.subset is None else chunk[self.subset]
+        keep = ~duplicated(frame)
+        rows = np.flatnonzero(keep)
+        fresh = frame.iloc[rows]
+        first = hash_rows(fresh)
+        second = hash_rows(fresh, hash_key=_SECOND_HASH_KEY)
+        seen = self.bloom.contains(first, second)
+        keep[rows[seen]] = False
+        self.bloom.add(first[~seen], second[~seen])
+        return chunk[keep].reset_index(drop=True)
+
+
+def iter_drop_duplicates(
+    chunks: Iterable[pd.DataFrame],
+    subset: Optional[List[str]] = None,
+    max_seen: Optional[int] = None,
+    expected_rows: Optional[int] = None,
+    error_rate: Optional[float] = None,
+) -> Iterator[pd.DataFrame]:
+    """Deduplicate a stream of chunks, yielding each chunk's new rows.
+
+    Exact with a :class:`StreamingDeduplicator` by default; passing
+    ``error_rate`` (with ``expected_rows``) switches to a
+    :class:`BloomDeduplicator`.
+    """
+    if error_rate is None:
+        deduplicator = StreamingDeduplicator(subset, max_seen)
+    elif expected_rows is None:
+        raise ValueError("expected_rows is required for Bloom-filter deduplication")
+    else:
+        deduplicator = BloomDeduplicator(expected_rows, error_rate, subset)
+    for chunk in chunks:
+        yield deduplicator.filter(chunk)
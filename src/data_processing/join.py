@@ -0,0 +1,301 @@
+"""Join engine behind ``dataframe_merge``.
+
+Keys are factorized into shared integer codes, the build side is laid out
+grouped by code, and the probe side turns into a pair of gather-index arrays
+from which the output is assembled column by column. Inputs already sorted on
+a single key take a ``searchsorted`` sort-merge path instead, and
+:func:`partitioned_join` hash-partitions both inputs to disk for joins that do
+not fit in memory.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .dedup import hash_rows
+
+JOIN_TYPES = ("inner", "left", "right", "outer")
+JOIN_METHODS = ("auto", "hash", "sort")
+
+
+def _as_list(on: str | Sequence[str]) -> list[str]:
+    return [on] if isinstance(on, str) else list(on)
+
+
+def factorize_join_keys(
+    left_keys: pd.DataFrame, right_keys: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray]:
+    """Dense codes shared by both sides; rows with a missing key get ``-1``."""
+    codes = None
+    for left_column, right_column in zip(left_keys, right_keys):
+        column_codes, uniques = pd.factorize(
+            pd.concat(
+                [left_keys[left_column], right_keys[right_column]], ignore_index=True
+            )
+        )
+        if codes is None:
+            codes = column_codes
+            continue
+        # Fold one column at a time so the combined code never overflows.
+        missing = (codes < 0) | (column_codes < 0)
+        codes, _ = pd.factorize(codes * len(uniques) + column_codes)
+        codes[missing] = -1
+    codes = codes.astype(np.int64, copy=False)
+    return codes[: len(left_keys)], codes[len(left_keys) :]
+
+
+def _hash_probe(
+    probe_codes: np.ndarray, build_codes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Match positions for each probe row against the build side.
+
+    Returns ``(starts, counts, order)``: the matches of probe row ``i`` are
+    ``order[starts[i] : starts[i] + counts[i]]``, in build-side row order.
+    """
+    order = np.argsort(build_codes, kind="stable")
+    order = order[np.count_nonzero(build_codes < 0) :]
+    n_codes = int(max(build_codes.max(initial=-1), probe_codes.max(initial=-1))) + 1
+    group_counts = np.bincount(build_codes[build_codes >= 0], minlength=n_codes)
+    group_starts = np.cumsum(group_counts) - group_counts
+    valid = probe_codes >= 0
+    safe = np.where(valid, probe_codes, 0)
+    counts = np.where(valid, group_counts[safe] if n_codes else 0, 0)
+    starts = np.where(valid, group_starts[safe] if n_codes else 0, 0)
+    return starts, counts, order
+
+
+def _sorted_probe(
+    probe_keys: np.ndarray, build_keys: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Same contract as :func:`_hash_probe` for inputs sorted ascending."""
+    starts = np.searchsorted(build_keys, probe_keys, side="left")
+    ends = np.searchsorted(build_keys, probe_keys, side="right")
+    return starts, ends - starts, np.arange(len(build_keys))
+
+
+def _expand(
+    starts: np.ndarray, counts: np.ndarray, order: np.ndarray, keep_unmatched: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Turn per-probe-row match ranges into probe and build gather indices."""
+    emit = np.maximum(counts, 1) if keep_unmatched else counts
+    total = int(emit.sum())
+    probe_idx = np.repeat(np.arange(len(counts)), emit)
+    offsets = np.arange(total) - np.repeat(np.cumsum(emit) - emit, emit)
+    if len(order) == 0:
+        return probe_idx, np.full(total, -1, dtype=np.int64)
+    build_idx = order.take(np.repeat(starts, emit) + offsets, mode="clip")
+    build_idx[~np.repeat(counts > 0, emit)] = -1
+    return probe_idx, build_idx
+
+
+def join_indices(
+    left_keys: pd.DataFrame,
+    right_keys: pd.DataFrame,
+    how: str = "inner",
+    method: str = "auto",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gather indices ``(left_idx, right_idx)`` for a join; ``-1`` marks no row.
+
+    ``inner`` and ``left`` joins come out in left row order with matches in
+    right row order, ``right`` joins in right row order, and ``outer`` joins
+    as the left join followed by the unmatched right rows. ``method="sort"``
+    requires a single key column sorted ascending on both sides; ``"auto"``
+    uses it whenever that holds and falls back to hashing otherwise.
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unsupported join type: {how}")
+    if method not in JOIN_METHODS:
+        raise ValueError(f"Unsupported join method: {method}")
+    if left_keys.shape[1] != right_keys.shape[1]:
+        raise ValueError("left_on and right_on must name the same number of columns")
+
+    sorted_inputs = (
+        left_keys.shape[1] == 1
+        and left_keys.iloc[:, 0].is_monotonic_increasing
+        and right_keys.iloc[:, 0].is_monotonic_increasing
+    )
+    if method == "sort" and not sorted_inputs:
+        raise ValueError(
+            "sort-merge join needs a single key sorted ascending on both sides"
+        )
+    if method == "sort" or (method == "auto" and sorted_inputs):
+        probe = _sorted_probe
+        left_in = left_keys.iloc[:, 0].to_numpy()
+        right_in = right_keys.iloc[:, 0].to_numpy()
+    else:
+        probe = _hash_probe
+        left_in, right_in = factorize_join_keys(left_keys, right_keys)
+
+    if how == "right" or (how == "inner" and len(left_in) < len(right_in)):
+        # Build on the left (the smaller side for inner joins).
+        right_idx, left_idx = _expand(
+            *probe(right_in, left_in), keep_unmatched=how == "right"
+        )
+        if how == "inner":
+            restore = np.argsort(left_idx, kind="stable")
+            left_idx, right_idx = left_idx[restore], right_idx[restore]
+        return left_idx, right_idx
+
+    left_idx, right_idx = _expand(
+        *probe(left_in, right_in), keep_unmatched=how != "inner"
+    )
+    if how == "outer":
+        matched = np.zeros(len(right_in), dtype=bool)
+        matched[right_idx[right_idx >= 0]] = True
+        extra = np.flatnonzero(~matched)
+        left_idx = np.concatenate(
+            [left_idx, np.full(len(extra), -1, dtype=left_idx.dtype)]
+        )
+        right_idx = np.concatenate([right_idx, extra])
+    return left_idx, right_idx
+
+
+def _gather(column: pd.Series, indices: np.ndarray) -> pd.Series:
+    # Reindexing a RangeIndex'd column turns -1 into a missing value and
+    # upcasts the dtype only when it has to.
+    return column.reset_index(drop=True).reindex(indices).reset_index(drop=True)
+
+
+def _assemble(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_on: list[str],
+    right_on: list[str],
+    left_idx: np.ndarray,
+    right_idx: np.ndarray,
+) -> pd.DataFrame:
+    columns = {name: _gather(left[name], left_idx) for name in left.columns}
+    left_missing = left_idx < 0
+    if left_missing.any():
+        for left_name, right_name in zip(left_on, right_on):
+            columns[left_name] = columns[left_name].where(
+                ~left_missing, _gather(right[right_name], right_idx)
+            )
+    for name in right.columns:
+        if name in right_on:
+            continue
+        values = _gather(right[name], right_idx)
+        if name in columns:
+            # Overlapping columns take the right-hand value where there is one.
+            values = values.where(right_idx >= 0, columns[name])
+        columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def hash_join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_on: str | Sequence[str],
+    right_on: str | Sequence[str] | None = None,
+    how: str = "inner",
+    method: str = "auto",
+) -> pd.DataFrame:
+    """Join two frames on key columns; see :func:`join_indices` for row order.
+
+    The output has the left columns followed by the right columns other than
+    ``right_on``. Missing keys never match.
+    """
+    left_on = _as_list(left_on)
+    right_on = left_on if right_on is None else _as_list(right_on)
+    left_idx, right_idx = join_indices(left[left_on], right[right_on], how, method)
+    return _assemble(left, right, left_on, right_on, left_idx, right_idx)
+
+
+def _partition_ids(keys: pd.DataFrame, partitions: int) -> np.ndarray:
+    return (hash_rows(keys) % np.uint64(partitions)).astype(np.int64)
+
+
+def _spill(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame],
+    on: list[str],
+    partitions: int,
+    directory: str,
+    side: str,
+) -> tuple[list[list[str]], pd.DataFrame | None]:
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    paths = [[] for _ in range(partitions)]
+    schema = None
+    for chunk_number, chunk in enumerate(chunks):
+        if schema is None:
+            schema = chunk.iloc[:0]
+        ids = _partition_ids(chunk[on], partitions)
+        for partition in np.unique(ids):
+            path = os.path.join(directory, f"{side}-{partition}-{chunk_number}.pkl")
+            chunk[ids == partition].to_pickle(path)
+            paths[partition].append(path)
+    return paths, schema
+
+
+def _load(paths: list[str], schema: pd.DataFrame) -> pd.DataFrame:
+    if not paths:
+        return schema
+    return pd.concat([pd.read_pickle(path) for path in paths], ignore_index=True)
+
+
+def iter_partitioned_join(
+    left: pd.DataFrame | Iterable[pd.DataFrame],
+    right: pd.DataFrame | Iterable[pd.DataFrame],
+    left_on: str | Sequence[str],
+    right_on: str | Sequence[str] | None = None,
+    how: str = "inner",
+    partitions: int = 16,
+    spill_dir: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Grace hash join: yield the joined rows one key partition at a time.
+
+    Both inputs (frames or iterables of chunks, e.g. ``read_csv(chunksize=...)``)
+    are hash-partitioned on their keys into pickle files under a temporary
+    directory in ``spill_dir``; matching partitions are then loaded in pairs
+    and joined with :func:`hash_join`, so only one partition pair is held in
+    memory at a time. The spill files are removed when the iterator finishes.
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unsupported join type: {how}")
+    if partitions < 1:
+        raise ValueError("partitions must be positive")
+    left_on = _as_list(left_on)
+    right_on = left_on if right_on is None else _as_list(right_on)
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        left_paths, left_schema = _spill(left, left_on, partitions, directory, "left")
+        right_paths, right_schema = _spill(
+            right, right_on, partitions, directory, "right"
+        )
+        if left_schema is None or right_schema is None:
+            return
+        for partition in range(partitions):
+            if not left_paths[partition] and not right_paths[partition]:
+                continue
+            yield hash_join(
+                _load(left_paths[partition], left_schema),
+                _load(right_paths[partition], right_schema),
+                left_on,
+                right_on,
+                how=how,
+                method="hash",
+            )
+
+
+def partitioned_join(
+    left: pd.DataFrame | Iterable[pd.DataFrame],
+    right: pd.DataFrame | Iterable[pd.DataFrame],
+    left_on: str | Sequence[str],
+    right_on: str | Sequence[str] | None = None,
+    how: str = "inner",
+    partitions: int = 16,
+    spill_dir: str | None = None,
+) -> pd.DataFrame:
+    """Collect :func:`iter_partitioned_join`; rows are grouped by partition."""
+    parts = list(
+        iter_partitioned_join(
+            left, right, left_on, right_on, how, partitions, spill_dir
+        )
+    )
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
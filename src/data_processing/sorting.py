@@ -0,0 +1,235 @@
+"""Sorting behind ``dataframe.sort_values``: stable multi-key sorts, top-k
+selection and an external merge sort for frames that do not fit in memory."""
+
+from __future__ import annotations
+
+import heapq
+import os
+import tempfile
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _sort_spec(
+    by: str | Sequence[str],
+    ascending: bool | Sequence[bool],
+    na_position: str | Sequence[str],
+) -> tuple[list[str], list[bool], list[bool]]:
+    """Normalize to per-key lists ``(by, ascending, nulls_first)``."""
+    by = [by] if isinstance(by, str) else list(by)
+    ascending = (
+        [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    )
+    na_position = (
+        [na_position] * len(by) if isinstance(na_position, str) else list(na_position)
+    )
+    if len(ascending) != len(by) or len(na_position) != len(by):
+        raise ValueError("ascending and na_position must match the number of sort keys")
+    for position in na_position:
+        if position not in ("first", "last"):
+            raise ValueError(f"Unsupported na_position: {position}")
+    return by, ascending, [position == "first" for position in na_position]
+
+
+def sort_indices(
+    df: pd.DataFrame,
+    by: str | Sequence[str],
+    ascending: bool | Sequence[bool] = True,
+    na_position: str | Sequence[str] = "last",
+) -> np.ndarray:
+    """Stable sort permutation of ``df`` rows; ties keep their row order.
+
+    Each key is factorized into sorted rank codes (flipped for descending
+    keys, with nulls moved to either end) and the codes are combined with
+    ``np.lexsort``, so mixed directions stay stable without negating values.
+    """
+    by, ascending, nulls_first = _sort_spec(by, ascending, na_position)
+    if not by:
+        return np.arange(len(df))
+    ranks = []
+    for column, asc, first in zip(by, ascending, nulls_first):
+        codes, uniques = pd.factorize(df[column], sort=True)
+        if not asc:
+            codes = np.where(codes >= 0, len(uniques) - 1 - codes, codes)
+        ranks.append(np.where(codes >= 0, codes, -1 if first else len(uniques)))
+    # lexsort treats its last key as the primary one.
+    return np.lexsort(ranks[::-1])
+
+
+def top_k_indices(values: Any, k: int, largest: bool = True) -> np.ndarray:
+    """Positions of the ``k`` largest (or smallest) numeric values, best first.
+
+    Uses ``np.argpartition`` to find the cut-off in linear time and only sorts
+    the selected rows. Ties keep their original order, including at the
+    cut-off, so the result equals the head of a stable full sort. Missing
+    values are never selected.
+    """
+    data = np.asarray(values)
+    if data.dtype.kind not in "biuf":
+        raise TypeError("top-k selection needs a numeric column")
+    if data.dtype.kind == "f":
+        candidates = np.flatnonzero(~np.isnan(data))
+        keys = -data[candidates] if largest else data[candidates]
+    elif data.dtype.kind == "u":
+        candidates = np.arange(len(data))
+        # Unsigned values can exceed int64; flip them within their own range.
+        keys = np.iinfo(data.dtype).max - data if largest else data
+    else:
+        candidates = np.arange(len(data))
+        # ~x == -x - 1 reverses integer order without overflowing at the minimum.
+        keys = ~data.astype(np.int64) if largest else data
+    k = max(min(k, len(keys)), 0)
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(keys):
+        cutoff = keys[np.argpartition(keys, k - 1)[k - 1]]
+        better = np.flatnonzero(keys < cutoff)
+        ties = np.flatnonzero(keys == cutoff)[: k - len(better)]
+        chosen = np.sort(np.concatenate([better, ties]))
+    else:
+        chosen = np.arange(len(keys))
+    chosen = chosen[np.argsort(keys[chosen], kind="stable")]
+    return candidates[chosen]
+
+
+def nlargest(df: pd.DataFrame, n: int, column: str) -> pd.DataFrame:
+    return df.iloc[top_k_indices(df[column].to_numpy(), n, largest=True)].reset_index(
+        drop=True
+    )
+
+
+def nsmallest(df: pd.DataFrame, n: int, column: str) -> pd.DataFrame:
+    return df.iloc[top_k_indices(df[column].to_numpy(), n, largest=False)].reset_index(
+        drop=True
+    )
+
+
+class _Descending:
+    """Wraps a value so that tuple comparison orders it in reverse."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: _Descending) -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def _row_keys(
+    block: pd.DataFrame, by: list[str], ascending: list[bool], nulls_first: list[bool]
+) -> list[tuple]:
+    """Per-row merge keys: ``(null_rank, value)`` per sort column."""
+    columns = []
+    for column, asc, first in zip(by, ascending, nulls_first):
+        missing = block[column].isna().tolist()
+        keys = []
+        for value, is_missing in zip(block[column].tolist(), missing):
+            if is_missing:
+                keys.append((0 if first else 1, 0))
+            else:
+                keys.append((1 if first else 0, value if asc else _Descending(value)))
+        columns.append(keys)
+    return list(zip(*columns))
+
+
+def _iter_chunks(
+    data: pd.DataFrame | Iterable[pd.DataFrame], chunk_rows: int
+) -> Iterator[pd.DataFrame]:
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_rows):
+            yield data.iloc[start : start + chunk_rows]
+    else:
+        yield from data
+
+
+def _iter_run(
+    paths: list[str], by: list[str], ascending: list[bool], nulls_first: list[bool]
+) -> Iterator[tuple[tuple, tuple]]:
+    for path in paths:
+        block = pd.read_pickle(path)
+        yield from zip(
+            _row_keys(block, by, ascending, nulls_first),
+            block.itertuples(index=False, name=None),
+        )
+
+
+def iter_external_sort(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    by: str | Sequence[str],
+    ascending: bool | Sequence[bool] = True,
+    na_position: str | Sequence[str] = "last",
+    chunk_rows: int = 100_000,
+    block_rows: int = 10_000,
+    spill_dir: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """External merge sort: yield the sorted rows in frames of ``chunk_rows``.
+
+    Each input chunk (a frame is cut into ``chunk_rows`` slices; an iterable
+    is consumed as given) is sorted in memory and written as a run of pickled
+    blocks of ``block_rows`` rows under a temporary directory in
+    ``spill_dir``. The runs are then k-way merged with ``heapq.merge``, which
+    only holds one block per run in memory. The result is stable, matching
+    ``dataframe.sort_values`` on the concatenated input.
+    """
+    if chunk_rows < 1 or block_rows < 1:
+        raise ValueError("chunk_rows and block_rows must be positive")
+    keys, ascending, nulls_first = _sort_spec(by, ascending, na_position)
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        runs = []
+        schema = None
+        for run_number, chunk in enumerate(_iter_chunks(data, chunk_rows)):
+            if schema is None:
+                schema = chunk.iloc[:0]
+            run = chunk.iloc[sort_indices(chunk, keys, ascending, na_position)]
+            paths = []
+            for start in range(0, len(run), block_rows):
+                path = os.path.join(directory, f"run-{run_number}-{start}.pkl")
+                run.iloc[start : start + block_rows].to_pickle(path)
+                paths.append(path)
+            runs.append(paths)
+        if schema is None:
+            return
+
+        merged = heapq.merge(
+            *(_iter_run(paths, keys, ascending, nulls_first) for paths in runs),
+            key=lambda item: item[0],
+        )
+        rows = []
+        for _, row in merged:
+            rows.append(row)
+            if len(rows) == chunk_rows:
+                yield _frame_like(schema, rows)
+                rows = []
+        if rows:
+            yield _frame_like(schema, rows)
+
+
+def _frame_like(schema: pd.DataFrame, rows: list[tuple]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=schema.columns)
+    return frame.astype(schema.dtypes.to_dict())
+
+
+def external_sort(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    by: str | Sequence[str],
+    ascending: bool | Sequence[bool] = True,
+    na_position: str | Sequence[str] = "last",
+    chunk_rows: int = 100_000,
+    block_rows: int = 10_000,
+    spill_dir: str | None = None,
+) -> pd.DataFrame:
+    """Collect :func:`iter_external_sort` into one frame."""
+    parts = list(
+        iter_external_sort(
+            data, by, ascending, na_position, chunk_rows, block_rows, spill_dir
+        )
+    )
+    if not parts:
+        return data.iloc[:0] if isinstance(data, pd.DataFrame) else pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
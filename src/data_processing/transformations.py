@@ -2,42 +2,20 @@ from typing import List, Any
 
 import pandas as pd
 
+from .aggregation import GroupedStats
+
 
 def pivot_table(
     df: pd.DataFrame, index: str, columns: str, values: str, aggfunc: str = "mean"
 ) -> dict[Any, dict[Any, float]]:
-    result = {}
-    if aggfunc == "mean":
-
-        def agg_func(values):
-            return sum(values) / len(values)
-    elif aggfunc == "sum":
-
-        def agg_func(values):
-            return sum(values)
-    elif aggfunc == "count":
-
-        def agg_func(values):
-            return len(values)
-    else:
+    if aggfunc not in ("mean", "sum", "count"):
         raise ValueError(f"Unsupported aggregation function: {aggfunc}")
-    grouped_data = {}
-    for i in range(len(df)):
-        row = df.iloc[i]
-        index_val = row[index]
-        column_val = row[columns]
-        value = row[values]
-        if index_val not in grouped_data:
-            grouped_data[index_val] = {}
-        if column_val not in grouped_data[index_val]:
-            grouped_data[index_val][column_val] = []
-        grouped_data[index_val][column_val].append(value)
-    for index_val in grouped_data:
-        result[index_val] = {}
-        for column_val in grouped_data[index_val]:
-            result[index_val][column_val] = agg_func(
-                grouped_data[index_val][column_val]
-            )
+    stats = GroupedStats.from_frame(df, [index, columns], {values: [aggfunc]})
+    result = {}
+    for (index_val, column_val), value in zip(
+        stats.keys, stats.result(values, aggfunc).tolist()
+    ):
+        result.setdefault(index_val, {})[column_val] = value
     return result
 
 
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def make_frame():
+    """Factory for the random mixed-type frames shared by the data_processing tests.
+
+    Columns: ``id`` (row number), ``kind`` (``"a"``/``"b"``/``"c"``), ``code``
+    (ints 0-9), ``qty`` (ints 0-49), ``price`` (continuous floats) and
+    ``score`` (whole-number floats 0-19); ``price`` and ``score`` are missing
+    on about ``na_fraction`` of the rows.
+    """
+
+    def make(rows=500, seed=0, na_fraction=0.1):
+        rng = np.random.default_rng(seed)
+        price = rng.normal(50, 20, rows)
+        score = rng.integers(0, 20, rows).astype(float)
+        price[rng.random(rows) < na_fraction] = np.nan
+        score[rng.random(rows) < na_fraction] = np.nan
+        return pd.DataFrame(
+            {
+                "id": np.arange(rows),
+                "kind": rng.choice(["a", "b", "c"], rows),
+                "code": rng.integers(0, 10, rows),
+                "qty": rng.integers(0, 50, rows),
+                "price": price,
+                "score": score,
+            }
+        )
+
+    return make
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.aggregation import GroupedStats, group_aggregate
+from src.data_processing.dataframe import groupby_mean
+from src.data_processing.transformations import pivot_table
+
+SALES = pd.DataFrame(
+    {
+        "region": ["a", "b", "a", "b", "a"],
+        "channel": ["x", "x", "y", "x", "x"],
+        "units": [2, 1, 4, 3, 6],
+    }
+)
+
+
+def test_groupby_mean():
+    assert groupby_mean(SALES, "region", "units") == {"a": 4.0, "b": 2.0}
+
+
+@pytest.mark.parametrize(
+    "aggfunc,expected",
+    [
+        ("sum", {"a": {"x": 8, "y": 4}, "b": {"x": 4}}),
+        ("mean", {"a": {"x": 4.0, "y": 4.0}, "b": {"x": 2.0}}),
+        ("count", {"a": {"x": 2, "y": 1}, "b": {"x": 2}}),
+    ],
+)
+def test_pivot_table(aggfunc, expected):
+    assert pivot_table(SALES, "region", "channel", "units", aggfunc) == expected
+
+
+@pytest.mark.parametrize("chunk_rows", [None, 2])
+def test_group_aggregate(chunk_rows):
+    aggs = ["sum", "count", "mean", "min", "max", "var"]
+    result = group_aggregate(
+        SALES, ["region", "channel"], {"units": aggs}, chunk_rows=chunk_rows
+    )
+    assert list(result) == [("a", "x"), ("b", "x"), ("a", "y")]
+    labels = [("units", agg) for agg in aggs]
+    assert [result[("a", "x")][label] for label in labels] == [8, 2, 4.0, 2, 6, 8.0]
+    assert [result[("b", "x")][label] for label in labels] == [4, 2, 2.0, 1, 3, 2.0]
+    single = [result[("a", "y")][label] for label in labels]
+    assert single[:5] == [4, 1, 4.0, 4, 4] and np.isnan(single[5])
+
+
+def test_groupby_mean_matches_row_loop_on_random_frames(make_frame):
+    df = make_frame(na_fraction=0)
+    sums, counts = {}, {}
+    for group, value in zip(df["kind"], df["price"]):
+        sums[group] = sums.get(group, 0.0) + value
+        counts[group] = counts.get(group, 0) + 1
+    expected = {group: sums[group] / counts[group] for group in sums}
+    result = groupby_mean(df, "kind", "price")
+    assert list(result) == list(expected)
+    for group in expected:
+        assert result[group] == pytest.approx(expected[group])
+
+
+@pytest.mark.parametrize("aggfunc", ["mean", "sum", "count"])
+def test_pivot_table_matches_pandas_on_random_frames(make_frame, aggfunc):
+    df = make_frame(na_fraction=0)
+    expected = df.pivot_table(
+        index="kind", columns="code", values="qty", aggfunc=aggfunc
+    )
+    result = pivot_table(df, "kind", "code", "qty", aggfunc)
+    assert list(result) == list(dict.fromkeys(df["kind"]))
+    for kind, row in result.items():
+        for code, value in row.items():
+            assert value == pytest.approx(expected.loc[kind, code])
+    assert sum(len(row) for row in result.values()) == expected.notna().sum().sum()
+
+
+def test_pivot_table_rejects_unknown_aggfunc():
+    with pytest.raises(ValueError, match="Unsupported aggregation function: median"):
+        pivot_table(SALES, "region", "channel", "units", "median")
+
+
+@pytest.mark.parametrize("chunk_rows", [None, 7, 64])
+def test_group_aggregate_matches_pandas_on_random_frames(make_frame, chunk_rows):
+    df = make_frame(na_fraction=0)
+    aggs = ["sum", "count", "mean", "min", "max", "var"]
+    result = group_aggregate(
+        df, ["kind", "code"], {"qty": aggs, "price": aggs}, chunk_rows=chunk_rows
+    )
+    expected = df.groupby(["kind", "code"])[["qty", "price"]].agg(aggs)
+    assert len(result) == len(expected)
+    for key, values in result.items():
+        for (column, agg), value in values.items():
+            assert value == pytest.approx(expected.loc[key, (column, agg)])
+
+
+def test_group_aggregate_empty_and_invalid():
+    assert group_aggregate(SALES.iloc[:0], "region", {"units": ["sum"]}) == {}
+    with pytest.raises(ValueError):
+        group_aggregate(SALES, "region", {"units": ["median"]})
+
+
+def test_count_does_not_need_numeric_values():
+    df = pd.DataFrame(
+        {"r": ["a", "a", "b"], "c": ["x", "y", "x"], "v": ["p", "q", "r"]}
+    )
+    assert pivot_table(df, "r", "c", "v", "count") == {
+        "a": {"x": 1, "y": 1},
+        "b": {"x": 1},
+    }
+
+
+def test_mean_skips_unrequested_moments(recwarn):
+    df = pd.DataFrame({"g": ["a", "a", "b"], "v": [1.0, np.nan, 2.0]})
+    result = groupby_mean(df, "g", "v")
+    assert np.isnan(result["a"]) and result["b"] == 2.0
+    stats = GroupedStats.from_frame(df, "g", {"v": ["mean"]})
+    assert set(stats.stats["v"]) == {"sum"}
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
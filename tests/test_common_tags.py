@@ -1,5 +1,6 @@
 from src.algorithms.string import find_common_tags
 
+
 def test_common_tags_1() -> None:
     articles_1 = [
         {"title": "Article 1", "tags": ["Python", "AI", "ML"]},
@@ -18,4 +19,62 @@ def test_common_tags_1() -> None:
         {"title": "Article 4", "tags": ["Python", "AI", "ML"]},
     ]
 
-    assert find_common_tags(articles_2) == expected
\ No newline at end of file
+    assert find_common_tags(articles_2) == expected
+
+
+def test_tag_index_matches_find_common_tags() -> None:
+    import random
+
+    from src.algorithms.string import TagIndex
+
+    rng = random.Random(0)
+    vocabulary = ["Python", "AI", "ML", "Data", "Web", "Rust"]
+    articles = [
+        {"title": f"Article {i}", "tags": rng.sample(vocabulary, rng.randint(0, 5))}
+        for i in range(200)
+    ]
+    index = TagIndex(articles)
+
+    for _ in range(50):
+        subset = rng.sample(range(len(articles)), rng.randint(1, 4))
+        expected = find_common_tags([articles[i] for i in subset])
+        assert index.common_tags(subset) == expected
+
+        counts = index.frequent_tags(subset, min_fraction=0.5)
+        for tag in vocabulary:
+            count = sum(tag in articles[i]["tags"] for i in subset)
+            assert (tag in counts) == (count * 2 >= len(subset))
+
+    assert index.common_tags([]) == set()
+
+
+def test_tag_index_incremental_updates() -> None:
+    from src.algorithms.string import TagIndex
+
+    index = TagIndex()
+    a = index.add({"tags": ["Python", "AI"]})
+    b = index.add({"tags": ["Python", "ML"]})
+    assert index.common_tags() == {"Python"}
+
+    index.remove(b)
+    assert index.common_tags() == {"Python", "AI"}
+    assert index.tag_count("ML") == 0
+    c = index.add({"tags": ["AI"]})
+    assert index.common_tags([a, c]) == {"AI"}
+    assert index.frequent_tags(min_fraction=0.5) == {"Python": 1, "AI": 2}
+
+
+def test_tag_index_spans_bitmap_chunks() -> None:
+    from src.algorithms.string import TagIndex
+
+    articles = [
+        {"tags": ["all", "even" if i % 2 == 0 else "odd"]} for i in range(70_000)
+    ]
+    articles[69_999]["tags"].append("rare")
+    index = TagIndex(articles)
+    assert index.tag_count("even") == 35_000
+    assert index.common_tags([2, 68_000, 69_998]) == {"all", "even"}
+    assert index.frequent_tags([1, 69_999], min_fraction=1.0) == {"all": 2, "odd": 2}
+    index.remove(69_999)
+    assert index.tag_count("rare") == 0
+    assert index.tag_count("odd") == 34_999
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from src.data_processing.dataframe import col, dataframe_filter, filter_rows
+
+ORDERS = pd.DataFrame(
+    {
+        "id": [1, 2, 3, 4, 5, 6],
+        "kind": ["a", "b", "a", "c", "b", "a"],
+        "qty": [3, 7, 3, 1, 9, 5],
+        "price": [9.5, None, 4.0, 12.0, None, 7.25],
+    }
+)
+
+
+def test_dataframe_filter_keeps_matching_rows_in_order():
+    result = dataframe_filter(ORDERS, "kind", "a")
+    assert result["id"].tolist() == [1, 3, 6]
+    assert result.index.tolist() == [0, 1, 2]
+    assert dataframe_filter(ORDERS, "qty", 3)["id"].tolist() == [1, 3]
+    assert dataframe_filter(ORDERS, "qty", 99).empty
+    assert list(dataframe_filter(ORDERS, "qty", 99).columns) == list(ORDERS.columns)
+
+
+def test_compound_predicates():
+    predicate = (col("qty").between(2, 6) & col("kind").isin(["a", "c"])) | (
+        col("price").isna() & (col("qty") > 8)
+    )
+    assert filter_rows(ORDERS, predicate)["id"].tolist() == [1, 3, 5, 6]
+    assert filter_rows(ORDERS, ~col("price").notna())["id"].tolist() == [2, 5]
+    assert filter_rows(ORDERS, predicate, chunk_rows=4)["id"].tolist() == [1, 3, 5, 6]
+
+
+def test_between_inclusive_modes():
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    assert filter_rows(df, col("x").between(1, 3, "neither")).x.tolist() == [2]
+    assert filter_rows(df, col("x").between(1, 3, "left")).x.tolist() == [1, 2]
+    with pytest.raises(ValueError):
+        col("x").between(1, 3, "sideways")
+
+
+def test_compound_predicates_match_pandas_on_random_frames(make_frame):
+    df = make_frame()
+    predicate = (col("code").between(2, 6) & col("kind").isin(["a", "c"])) | (
+        ~col("price").notna() & (col("code") > 8)
+    )
+    expected = df[
+        (df.code.between(2, 6) & df.kind.isin(["a", "c"]))
+        | (df.price.isna() & (df.code > 8))
+    ].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(filter_rows(df, predicate), expected)
+    pd.testing.assert_frame_equal(filter_rows(df, predicate, chunk_rows=37), expected)
+    pd.testing.assert_frame_equal(
+        dataframe_filter(df, "kind", "b"),
+        df[df.kind == "b"].reset_index(drop=True),
+    )
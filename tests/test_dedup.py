@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing import dedup
+from src.data_processing.dataframe import drop_duplicates
+from src.data_processing.dedup import (
+    BloomFilter,
+    StreamingDeduplicator,
+    duplicated,
+    hash_rows,
+    iter_drop_duplicates,
+)
+
+EVENTS = pd.DataFrame(
+    {
+        "user": [1, 2, 1, 3, 2, 1, 2],
+        "action": ["x", "y", "x", "x", None, "y", None],
+    }
+)
+DUPLICATED = [False, False, True, False, False, False, True]
+
+
+def test_duplicated_treats_missing_values_as_equal():
+    assert duplicated(EVENTS).tolist() == DUPLICATED
+    assert duplicated(EVENTS, ["user"]).tolist() == [
+        False,
+        False,
+        True,
+        False,
+        True,
+        True,
+        True,
+    ]
+
+
+def test_drop_duplicates():
+    result = drop_duplicates(EVENTS)
+    assert result["user"].tolist() == [1, 2, 3, 2, 1]
+    assert result.index.tolist() == list(range(5))
+    assert drop_duplicates(EVENTS, ["user"])["user"].tolist() == [1, 2, 3]
+
+
+def test_hash_collisions_are_resolved_exactly(monkeypatch):
+    monkeypatch.setattr(
+        dedup, "hash_rows", lambda frame: np.zeros(len(frame), np.uint64)
+    )
+    assert duplicated(EVENTS).tolist() == DUPLICATED
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"max_seen": 10}, {"expected_rows": 100, "error_rate": 0.001}]
+)
+def test_streaming_dedup_across_chunks(options):
+    chunks = [EVENTS.iloc[:3], EVENTS.iloc[3:]]
+    result = list(iter_drop_duplicates(chunks, **options))
+    assert [chunk["user"].tolist() for chunk in result] == [[1, 2], [3, 2, 1]]
+    result = list(iter_drop_duplicates(chunks, ["user"], **options))
+    assert [chunk["user"].tolist() for chunk in result] == [[1, 2], [3]]
+
+
+@pytest.mark.parametrize(
+    "subset", [None, ["code"], ["code", "kind"], ["kind", "score"]]
+)
+def test_drop_duplicates_matches_pandas_on_random_frames(make_frame, subset):
+    df = make_frame()
+    expected = df.drop_duplicates(subset=subset).reset_index(drop=True)
+    pd.testing.assert_frame_equal(drop_duplicates(df, subset), expected)
+
+
+def test_hash_rows_ignores_numeric_dtype():
+    ints = pd.DataFrame({"k": [1, 0, 2], "s": ["a", "b", "c"]})
+    floats = pd.DataFrame({"k": [1.0, -0.0, 2.0], "s": ["a", "b", "c"]})
+    np.testing.assert_array_equal(hash_rows(ints), hash_rows(floats))
+
+
+def _chunks(df, size=70):
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+def test_streaming_dedup_matches_in_memory_on_random_frames(make_frame):
+    df = make_frame()
+    result = pd.concat(
+        iter_drop_duplicates(_chunks(df), subset=["code", "kind"]), ignore_index=True
+    )
+    pd.testing.assert_frame_equal(result, drop_duplicates(df, ["code", "kind"]))
+
+
+def test_streaming_dedup_bounds_seen_rows():
+    deduplicator = StreamingDeduplicator(max_seen=2)
+    first = deduplicator.filter(pd.DataFrame({"v": [1, 2, 3, 1]}))
+    assert first["v"].tolist() == [1, 2, 3]
+    assert len(deduplicator) == 2
+    # 1 was evicted, so it passes again; 3 is still remembered.
+    assert deduplicator.filter(pd.DataFrame({"v": [3, 1]}))["v"].tolist() == [1]
+
+
+def test_bloom_dedup_close_to_exact_on_random_frames(make_frame):
+    df = make_frame(rows=3000)
+    df["id"] = df["id"] % 1500
+    exact = drop_duplicates(df, ["id"])
+    approx = pd.concat(
+        iter_drop_duplicates(
+            _chunks(df, 250), ["id"], expected_rows=1500, error_rate=0.01
+        ),
+        ignore_index=True,
+    )
+    assert not approx["id"].duplicated().any()
+    assert len(approx) >= 0.97 * len(exact)
+    with pytest.raises(ValueError):
+        next(iter_drop_duplicates(_chunks(df), error_rate=0.01))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.001)
+    rng = np.random.default_rng(1)
+    first, second = (
+        rng.integers(0, 2**63, 1000, dtype=np.int64).astype(np.uint64) for _ in range(2)
+    )
+    bloom.add(first, second)
+    assert bloom.contains(first, second).all()
+    others = rng.integers(0, 2**63, 10000, dtype=np.int64).astype(np.uint64)
+    assert bloom.contains(others, others[::-1]).mean() < 0.01
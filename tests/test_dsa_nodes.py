@@ -1,5 +1,5 @@
 from src.algorithms.graph import find_cycle_vertices, find_node_clusters
-from src.algorithms.caching import time_based_cache
+from src.algorithms.caching import repr_key, time_based_cache
 import time
 import pytest
 
@@ -249,7 +249,6 @@ def test_duplicate_node_ids_last_one_wins():
     assert found_node_1.get("value") == "second"
 
 
-
 call_counter = [0]
 
 
@@ -417,3 +416,227 @@ def test_different_cache_instances():
     assert res_b2 == 15
     assert call_counter_a[0] == 1
     assert call_counter_b[0] == 1
+
+
+def test_cache_maxsize_evicts_least_recently_used():
+    call_counter[0] = 0
+    cached_func = time_based_cache(expiry_seconds=10, maxsize=2)(_test_func_simple)
+
+    cached_func(1, 1)
+    cached_func(2, 2)
+    cached_func(1, 1)
+    cached_func(3, 3)
+    assert call_counter[0] == 3
+
+    cached_func(1, 1)
+    assert call_counter[0] == 3
+    cached_func(2, 2)
+    assert call_counter[0] == 4
+
+    info = cached_func.cache_info()
+    assert info.hits == 2
+    assert info.misses == 4
+    assert info.evictions == 2
+    assert info.currsize == 2
+
+
+def test_cache_purges_expired_entries():
+    expiry_duration = 0.05
+    cached_func = time_based_cache(expiry_seconds=expiry_duration)(_test_func_simple)
+
+    for i in range(5):
+        cached_func(i, i)
+    assert cached_func.cache_info().currsize == 5
+
+    time.sleep(expiry_duration + 0.05)
+    cached_func(100, 100)
+    info = cached_func.cache_info()
+    assert info.expirations == 5
+    assert info.currsize == 1
+
+
+def test_hashed_key_fingerprints_arrays():
+    import numpy as np
+    from src.algorithms.caching import hashed_key
+
+    calls = [0]
+
+    def total(arr):
+        calls[0] += 1
+        return float(arr.sum())
+
+    cached_total = time_based_cache(expiry_seconds=10, key_func=hashed_key)(total)
+    big = np.arange(100_000, dtype=np.float64)
+
+    assert cached_total(big) == cached_total(big.copy())
+    assert calls[0] == 1
+    assert cached_total(big.astype(np.int64)) == float(big.sum())
+    assert calls[0] == 2
+
+
+def test_hashed_key_object_arrays_and_typed_scalars():
+    import numpy as np
+    from src.algorithms.caching import hashed_key
+
+    cached_first = time_based_cache(expiry_seconds=10, key_func=hashed_key)(
+        lambda a: a[0]
+    )
+    for i in range(200):
+        assert cached_first(np.array([str(i)], dtype=object)) == str(i)
+
+    cached_repr = time_based_cache(expiry_seconds=10, key_func=hashed_key)(repr)
+    assert [cached_repr(1), cached_repr(True), cached_repr(1.0)] == ["1", "True", "1.0"]
+
+
+def test_hashed_key_fingerprints_arrays_nested_in_containers():
+    import numpy as np
+    from src.algorithms.caching import hashed_key
+
+    calls = [0]
+
+    def total(arrays):
+        calls[0] += 1
+        return sum(float(arr.sum()) for arr in arrays)
+
+    cached_total = time_based_cache(expiry_seconds=10, key_func=hashed_key)(total)
+    first = np.zeros(10_000)
+    second = first.copy()
+    second[5_000] = 1.0  # same truncated repr as ``first``
+
+    assert cached_total([first]) == 0.0
+    assert cached_total([second]) == 1.0
+    assert cached_total([first.copy()]) == 0.0
+    assert calls[0] == 2
+    assert hashed_key(({"a": first},), {}) != hashed_key(({"a": second},), {})
+    assert hashed_key((np.array([first], dtype=object),), {}) != hashed_key(
+        (np.array([second], dtype=object),), {}
+    )
+
+
+def test_single_flight_coalesces_concurrent_misses():
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = [0]
+
+    def slow_square(x):
+        calls[0] += 1
+        time.sleep(0.05)
+        return x * x
+
+    cached = time_based_cache(expiry_seconds=10, single_flight=True)(slow_square)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cached, [7] * 16))
+
+    assert results == [49] * 16
+    assert calls[0] == 1
+
+
+def test_async_function_caches_awaited_result():
+    import asyncio
+
+    calls = [0]
+
+    async def fetch(x):
+        calls[0] += 1
+        await asyncio.sleep(0.01)
+        return x + 1
+
+    cached = time_based_cache(expiry_seconds=10, single_flight=True)(fetch)
+
+    async def main():
+        first = await asyncio.gather(*(cached(1) for _ in range(5)))
+        second = await cached(1)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == [2] * 5
+    assert second == 2
+    assert calls[0] == 1
+
+
+def test_stale_while_revalidate_serves_old_value():
+    values = iter(range(100))
+
+    def next_value():
+        return next(values)
+
+    cached = time_based_cache(expiry_seconds=0.05, stale_while_revalidate=10)(
+        next_value
+    )
+    assert cached() == 0
+    time.sleep(0.1)
+    assert cached() == 0
+
+    for _ in range(50):
+        if cached.cache.peek(repr_key((), {}))[0]:
+            break
+        time.sleep(0.01)
+    assert cached() == 1
+    assert cached.cache_info().stale_hits == 1
+
+
+def test_disk_tier_survives_new_decorator(tmp_path):
+    import numpy as np
+
+    calls = [0]
+
+    def build(n):
+        calls[0] += 1
+        return np.arange(n, dtype=np.int32).reshape(2, -1)
+
+    path = tmp_path / "cache.sqlite"
+    first = time_based_cache(expiry_seconds=10, disk_path=path)(build)
+    expected = first(6)
+    assert calls[0] == 1
+
+    # A fresh decorator (as after a restart) starts with an empty memory tier.
+    second = time_based_cache(expiry_seconds=10, disk_path=path)(build)
+    result = second(6)
+    assert calls[0] == 1
+    assert result.dtype == np.int32
+    np.testing.assert_array_equal(result, expected)
+    assert second.cache.backing.hits == 1
+
+
+def test_disk_tier_respects_expiry(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    call_counter[0] = 0
+    first = time_based_cache(expiry_seconds=0.05, disk_path=path)(_test_func_simple)
+    first(1, 2)
+    time.sleep(0.1)
+
+    second = time_based_cache(expiry_seconds=0.05, disk_path=path)(_test_func_simple)
+    assert second(1, 2) == 3
+    assert call_counter[0] == 2
+
+
+def test_disk_tier_skips_unpicklable_values(tmp_path):
+    import threading
+
+    calls = [0]
+
+    def make_lock(name):
+        calls[0] += 1
+        return threading.Lock()
+
+    cached = time_based_cache(expiry_seconds=10, disk_path=tmp_path / "c.sqlite")(
+        make_lock
+    )
+    lock = cached("a")
+    assert cached("a") is lock
+    assert calls[0] == 1
+
+
+def test_disk_promotion_keeps_purge_order(tmp_path):
+    from src.algorithms.caching import SQLiteCacheStore, TTLCache
+
+    store = SQLiteCacheStore(tmp_path / "c.sqlite")
+    store.set("old", 1, now=100.0)
+    cache = TTLCache(expiry_seconds=10, backing=store)
+    cache.store("new", 2, now=105.0)
+
+    assert cache.lookup("old", now=106.0) == (True, 1)
+    # "old" expires at 110 even though it was promoted after "new".
+    assert cache.purge(now=111.0) == 1
+    assert "old" not in cache and "new" in cache
+    assert cache.purge(now=116.0) == 1
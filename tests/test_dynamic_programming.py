@@ -0,0 +1,194 @@
+import random
+from functools import lru_cache, reduce
+
+import numpy as np
+import pytest
+
+from src.algorithms.dynamic_programming import (
+    coin_change,
+    coin_change_batch,
+    fib_mod,
+    fibonacci,
+    fibonacci_batch,
+    knapsack,
+    knapsack_batch,
+    iter_positive_row_sums,
+    knapsack_items,
+    matrix_chain_order,
+    matrix_sum,
+    matrix_chain_plan,
+    multiply_chain,
+    write_positive_row_sums,
+)
+
+
+def _reference_chain_cost(dims):
+    @lru_cache(maxsize=None)
+    def dp(i, j):
+        if i == j:
+            return 0
+        return min(
+            dp(i, k) + dp(k + 1, j) + dims[i][0] * dims[k][1] * dims[j][1]
+            for k in range(i, j)
+        )
+
+    return dp(0, len(dims) - 1)
+
+
+def _plan_cost(plan, dims):
+    if isinstance(plan, int):
+        return 0, dims[plan][0], dims[plan][1]
+    left_cost, rows, inner = _plan_cost(plan[0], dims)
+    right_cost, _, cols = _plan_cost(plan[1], dims)
+    return left_cost + right_cost + rows * inner * cols, rows, cols
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matrix_chain_plan_is_optimal(seed):
+    rng = random.Random(seed)
+    sizes = [rng.randint(1, 40) for _ in range(rng.randint(2, 9))]
+    dims = list(zip(sizes, sizes[1:]))
+
+    cost, plan = matrix_chain_plan(dims)
+    assert cost == matrix_chain_order(dims) == _reference_chain_cost(tuple(dims))
+    assert _plan_cost(plan, dims)[0] == cost
+
+
+def test_matrix_chain_plan_shape():
+    assert matrix_chain_plan([(10, 30), (30, 5), (5, 60)]) == (4500, ((0, 1), 2))
+    assert matrix_chain_plan([(3, 4)]) == (0, 0)
+
+
+def test_multiply_chain_matches_left_to_right_product():
+    rng = np.random.default_rng(0)
+    sizes = [30, 2, 40, 3, 25, 1, 10]
+    arrays = [rng.standard_normal((a, b)) for a, b in zip(sizes, sizes[1:])]
+    np.testing.assert_allclose(multiply_chain(arrays), reduce(np.matmul, arrays))
+
+    with pytest.raises(ValueError):
+        multiply_chain([np.ones((2, 3)), np.ones((2, 3))])
+
+
+def _reference_coin_change(coins, amount, index):
+    if amount == 0:
+        return 1
+    if amount < 0 or index >= len(coins):
+        return 0
+    return _reference_coin_change(
+        coins, amount - coins[index], index
+    ) + _reference_coin_change(coins, amount, index + 1)
+
+
+def _reference_knapsack(weights, values, capacity, n):
+    if n == 0 or capacity == 0:
+        return 0
+    if weights[n - 1] > capacity:
+        return _reference_knapsack(weights, values, capacity, n - 1)
+    return max(
+        values[n - 1]
+        + _reference_knapsack(weights, values, capacity - weights[n - 1], n - 1),
+        _reference_knapsack(weights, values, capacity, n - 1),
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_coin_change_matches_recursion(seed):
+    rng = random.Random(seed)
+    coins = rng.sample(range(1, 15), 4)
+    for amount in range(-1, 40):
+        for index in range(len(coins) + 1):
+            assert coin_change(coins, amount, index) == _reference_coin_change(
+                coins, amount, index
+            )
+    amounts = list(range(-2, 40))
+    assert coin_change_batch(coins, amounts) == [
+        _reference_coin_change(coins, a, 0) for a in amounts
+    ]
+
+
+def test_coin_change_large_amount_is_exact():
+    # Far beyond int64; checked against a pure-Python rolling table.
+    coins, amount = [1, 2, 5, 10, 20, 50, 100, 200], 100_000
+    ways = [1] + [0] * amount
+    for coin in coins:
+        for a in range(coin, amount + 1):
+            ways[a] += ways[a - coin]
+    assert coin_change(coins, amount, 0) == ways[amount]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_knapsack_matches_recursion(seed):
+    rng = random.Random(seed)
+    weights = [rng.randint(1, 12) for _ in range(10)]
+    values = [rng.randint(1, 30) for _ in range(10)]
+    capacities = list(range(0, 45, 3))
+
+    expected = [
+        _reference_knapsack(weights, values, c, len(weights)) for c in capacities
+    ]
+    assert [knapsack(weights, values, c, len(weights)) for c in capacities] == expected
+    assert knapsack(weights, values, 20, 4) == _reference_knapsack(
+        weights, values, 20, 4
+    )
+    assert knapsack(weights, values, -1, len(weights)) == 0
+    assert knapsack_batch(weights, values, capacities).tolist() == expected
+
+    value, items = knapsack_items(weights, values, 30)
+    assert value == expected[10]
+    assert sum(weights[i] for i in items) <= 30
+    assert sum(values[i] for i in items) == value
+
+
+def _fibonacci_table(n):
+    table = [0, 1]
+    for _ in range(n):
+        table.append(table[-1] + table[-2])
+    return table
+
+
+def test_fibonacci_fast_doubling():
+    table = _fibonacci_table(500)
+    assert [fibonacci(n) for n in range(-2, 500)] == [
+        n if n <= 1 else table[n] for n in range(-2, 500)
+    ]
+    assert fibonacci(10_000) % 10**9 == fib_mod(10_000, 10**9)
+
+
+def test_fib_mod_huge_index():
+    # Pisano period for 10 is 60.
+    assert fib_mod(10**18 + 7, 10) == _fibonacci_table(60)[(10**18 + 7) % 60] % 10
+
+
+@pytest.mark.parametrize("modulus", [None, 1_000_000_007, 2**61 - 1])
+def test_fibonacci_batch(modulus):
+    table = _fibonacci_table(400)
+    ns = [0, 1, 399, 5, 5, 200, -1, 64]
+    expected = [n if n <= 1 else table[n] for n in ns]
+    if modulus is None:
+        assert fibonacci_batch(ns) == expected
+        assert fibonacci_batch(np.array(ns)) == expected
+    else:
+        assert fibonacci_batch(ns, modulus).tolist() == [v % modulus for v in expected]
+
+
+def test_matrix_sum_lists_and_arrays():
+    matrix = [[1, 2], [-5, 1], [0, 0], [3, -1]]
+    assert matrix_sum(matrix) == [3, 2]
+    assert matrix_sum(np.array(matrix)) == [3, 2]
+
+
+@pytest.mark.parametrize("workers", [None, 3])
+def test_row_sums_stream_from_memmap(tmp_path, workers):
+    rng = np.random.default_rng(1)
+    data = rng.integers(-10, 10, size=(1_000, 7), dtype=np.int32)
+    path = tmp_path / "matrix.bin"
+    data.tofile(path)
+    mapped = np.memmap(path, dtype=np.int32, mode="r", shape=data.shape)
+
+    expected = matrix_sum(data.tolist())
+    assert (
+        list(iter_positive_row_sums(mapped, chunk_rows=64, workers=workers)) == expected
+    )
+
+    out = write_positive_row_sums(mapped, tmp_path / "sums.bin", 64, workers)
+    assert out.tolist() == expected
@@ -0,0 +1,338 @@
+import random
+
+import pytest
+
+from src.algorithms.graph import (
+    CSRGraph,
+    CycleVertexTracker,
+    FlowGraphIndex,
+    PathFinder,
+    UnionFind,
+    build_condensation,
+    calculate_node_betweenness,
+    find_cycle_vertices,
+    find_last_node,
+    find_leaf_nodes,
+    find_node_clusters,
+    find_node_with_highest_degree,
+    find_strongly_connected_components,
+    graph_traversal,
+)
+
+
+def _random_flow(num_nodes=12, num_edges=20, seed=0):
+    rng = random.Random(seed)
+    nodes = [{"id": f"n{i}", "payload": i} for i in range(num_nodes)]
+    edges = [
+        {
+            "source": f"n{rng.randrange(num_nodes)}",
+            "target": f"n{rng.randrange(num_nodes)}",
+        }
+        for _ in range(num_edges)
+    ]
+    return nodes, edges
+
+
+def test_csr_structure():
+    graph = CSRGraph.from_edges([("a", "b"), ("a", "c"), ("c", "a")], nodes=["z"])
+    assert graph.labels == ["z", "a", "b", "c"]
+    assert graph.num_edges == 3
+    assert graph.out_degree().tolist() == [0, 2, 0, 1]
+    assert graph.in_degree().tolist() == [0, 1, 1, 1]
+    assert graph["a"] == ["b", "c"]
+    assert graph.get("missing", []) == []
+    assert sorted(graph.edges()) == [("a", "b"), ("a", "c"), ("c", "a")]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_csr_matches_flow_functions(seed):
+    nodes, edges = _random_flow(seed=seed)
+    graph = CSRGraph.from_flow(nodes, edges)
+
+    assert find_last_node(graph) == find_last_node(nodes, edges)
+    assert find_leaf_nodes(graph) == find_leaf_nodes(nodes, edges)
+    assert find_strongly_connected_components(graph) == (
+        find_strongly_connected_components([n["id"] for n in nodes], edges)
+    )
+    assert calculate_node_betweenness(graph) == pytest.approx(
+        calculate_node_betweenness([n["id"] for n in nodes], edges)
+    )
+    assert sorted(
+        map(sorted, ([n["id"] for n in c] for c in find_node_clusters(graph)))
+    ) == sorted(
+        map(sorted, ([n["id"] for n in c] for c in find_node_clusters(nodes, edges)))
+    )
+    pairs = [(e["source"], e["target"]) for e in edges]
+    assert find_cycle_vertices(graph) == find_cycle_vertices(pairs)
+
+
+def test_csr_adjacency_functions():
+    connections = {"a": ["b", "c"], "b": ["c"], "c": ["a"], "d": ["c"]}
+    graph = CSRGraph.from_adjacency(connections)
+
+    assert find_node_with_highest_degree(graph) == find_node_with_highest_degree(
+        list(connections), connections
+    )
+    assert graph_traversal(graph, "a") == graph_traversal(connections, "a")
+    assert PathFinder(graph).find_shortest_path("d", "b") == ["d", "c", "a", "b"]
+
+
+def test_csr_clusters_reject_undeclared_nodes():
+    graph = CSRGraph.from_flow([{"id": 1}], [{"source": 1, "target": 99}])
+    with pytest.raises(KeyError):
+        find_node_clusters(graph)
+
+
+def _random_digraph_edges(num_nodes=30, num_edges=80, seed=0):
+    rng = random.Random(seed)
+    pairs = {
+        (rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(num_edges)
+    }
+    return [{"source": u, "target": v} for u, v in sorted(pairs) if u != v]
+
+
+def test_betweenness_matches_networkx():
+    import networkx as nx
+
+    nodes = list(range(30))
+    edges = _random_digraph_edges()
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from((e["source"], e["target"]) for e in edges)
+
+    expected = nx.betweenness_centrality(graph, normalized=False)
+    assert calculate_node_betweenness(nodes, edges) == pytest.approx(expected)
+
+
+def test_betweenness_parallel_and_sampled_modes():
+    nodes = list(range(30))
+    edges = _random_digraph_edges(seed=1)
+    exact = calculate_node_betweenness(nodes, edges)
+
+    assert calculate_node_betweenness(nodes, edges, workers=2) == pytest.approx(exact)
+    assert calculate_node_betweenness(nodes, edges, k=30) == pytest.approx(exact)
+
+    sampled = calculate_node_betweenness(nodes, edges, k=10, seed=42)
+    assert sampled == calculate_node_betweenness(nodes, edges, k=10, seed=42)
+    assert set(sampled) == set(nodes)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cycle_vertices_matches_simple_cycles(seed):
+    import networkx as nx
+
+    rng = random.Random(seed)
+    edges = [(rng.randrange(15), rng.randrange(15)) for _ in range(20)]
+    expected = sorted(
+        {v for cycle in nx.simple_cycles(nx.DiGraph(edges)) for v in cycle}
+    )
+
+    assert find_cycle_vertices(edges) == expected
+    assert find_cycle_vertices(edges, engine="networkx") == expected
+
+
+def test_cycle_vertices_accepts_adjacency_mappings():
+    assert find_cycle_vertices({"n1": ["n2"], "n2": ["n1"]}) == ["n1", "n2"]
+    assert find_cycle_vertices({"ab": ["ba"], "ba": ["ab"]}) == ["ab", "ba"]
+    assert find_cycle_vertices({"a": ["b"], "b": [], "c": ["c"]}) == ["c"]
+
+
+def test_cycle_vertices_accepts_graph_objects():
+    import networkx as nx
+
+    graph = nx.DiGraph([(1, 2), (2, 3), (3, 1), (3, 4)])
+    graph.add_node(5)
+    assert find_cycle_vertices(graph) == [1, 2, 3]
+    assert find_cycle_vertices(graph, engine="networkx") == [1, 2, 3]
+    assert find_cycle_vertices(nx.Graph([(1, 2)])) == [1, 2]
+
+
+def test_cycle_vertex_tracker_is_incremental():
+    rng = random.Random(7)
+    edges = [(rng.randrange(12), rng.randrange(12)) for _ in range(30)]
+    tracker = CycleVertexTracker()
+    for i, (u, v) in enumerate(edges):
+        tracker.add_edge(u, v)
+        assert tracker.cycle_vertices() == find_cycle_vertices(edges[: i + 1])
+
+
+def _bfs_distance(graph, start, end):
+    from collections import deque
+
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbor in graph.get(node, []):
+            if neighbor not in dist:
+                dist[neighbor] = dist[node] + 1
+                queue.append(neighbor)
+    return dist.get(end)
+
+
+def _is_path(graph, path):
+    return all(b in graph.get(a, []) for a, b in zip(path, path[1:]))
+
+
+def test_path_finder_single_and_batch_queries_are_shortest():
+    rng = random.Random(3)
+    graph = {i: [] for i in range(40)}
+    for _ in range(90):
+        graph[rng.randrange(40)].append(rng.randrange(40))
+    finder = PathFinder(graph)
+    pairs = [(rng.randrange(40), rng.randrange(40)) for _ in range(60)]
+
+    batch = finder.find_shortest_paths(pairs)
+    for (start, end), path in zip(pairs, batch):
+        single = PathFinder(graph).find_shortest_path(start, end)
+        distance = _bfs_distance(graph, start, end)
+        if distance is None:
+            assert path == single == []
+        else:
+            assert len(path) == len(single) == distance + 1
+            assert path[0] == start and path[-1] == end
+            assert _is_path(graph, path) and _is_path(graph, single)
+
+
+def test_path_finder_cache_invalidated_on_edit():
+    graph = {"a": ["b"], "b": ["c"], "c": []}
+    finder = PathFinder(graph)
+    assert finder.find_shortest_path("a", "c") == ["a", "b", "c"]
+
+    finder.add_edge("a", "c")
+    assert finder.find_shortest_path("a", "c") == ["a", "c"]
+
+    finder.remove_edge("a", "c")
+    finder.remove_edge("b", "c")
+    assert finder.find_shortest_path("a", "c") == []
+
+
+def test_flow_graph_index_tracks_edits():
+    rng = random.Random(11)
+    nodes = [{"id": i} for i in range(15)]
+    index = FlowGraphIndex(nodes)
+    edges = []
+    for step in range(200):
+        if edges and rng.random() < 0.4:
+            edge = edges.pop(rng.randrange(len(edges)))
+            index.remove_edge(edge)
+        else:
+            edge = {"source": rng.randrange(15), "target": rng.randrange(15)}
+            if any(e == edge for e in edges):
+                continue
+            edges.append(edge)
+            index.add_edge(edge)
+
+        connections = {}
+        for e in edges:
+            connections.setdefault(e["source"], []).append(e["target"])
+        assert find_last_node(index) == find_last_node(nodes, edges)
+        assert find_leaf_nodes(index) == find_leaf_nodes(nodes, edges)
+        assert find_node_with_highest_degree(index) == find_node_with_highest_degree(
+            [n["id"] for n in nodes], connections
+        )
+
+
+def test_highest_degree_counts_parallel_in_edges_once():
+    nodes = ["n0", "n1"]
+    connections = {"n1": ["n0", "n0", "n0"]}
+    edges = [{"source": "n1", "target": "n0"}] * 3
+    assert find_node_with_highest_degree(nodes, connections) == "n1"
+    index = FlowGraphIndex([{"id": n} for n in nodes], edges)
+    assert find_node_with_highest_degree(index) == "n1"
+    graph = CSRGraph.from_edges([("n1", "n0")] * 3, nodes)
+    assert find_node_with_highest_degree(graph) == "n1"
+
+
+def test_flow_graph_index_remove_node_drops_edges():
+    index = FlowGraphIndex(
+        [{"id": "a"}, {"id": "b"}, {"id": "c"}],
+        [{"source": "a", "target": "b"}, {"source": "b", "target": "c"}],
+    )
+    assert index.last_node() == {"id": "c"}
+    index.remove_node("c")
+    assert index.last_node() == {"id": "b"}
+    assert index.out_degree("b") == 0
+    with pytest.raises(KeyError):
+        index.remove_edge({"source": "b", "target": "c"})
+
+
+def _cluster_ids(clusters):
+    return [[node["id"] for node in cluster] for cluster in clusters]
+
+
+def test_union_find_streams_edges_and_matches_bfs():
+    nodes, edges = _random_flow(num_nodes=40, num_edges=30, seed=5)
+    components = UnionFind(nodes)
+    components.add_edges(iter((e["source"], e["target"]) for e in edges))
+
+    expected = _cluster_ids(find_node_clusters(CSRGraph.from_flow(nodes, edges)))
+    assert _cluster_ids(components.clusters()) == expected
+    assert components.components == len(expected)
+
+
+def test_cluster_members_follow_first_appearance_for_both_inputs():
+    nodes = [{"id": label} for label in "ABCD"]
+    edges = [
+        {"source": "A", "target": "C"},
+        {"source": "C", "target": "B"},
+        {"source": "D", "target": "B"},
+    ]
+    expected = [["A", "B", "C", "D"]]
+    assert _cluster_ids(find_node_clusters(nodes, edges)) == expected
+    assert (
+        _cluster_ids(find_node_clusters(CSRGraph.from_flow(nodes, edges))) == expected
+    )
+
+
+def test_union_find_incremental_edges():
+    components = UnionFind([{"id": i} for i in range(4)])
+    assert components.components == 4
+    components.add_edge({"source": 0, "target": 1})
+    components.add_edge((2, 3))
+    assert not components.connected(1, 2)
+    components.add_edge((1, 3))
+    assert components.connected(0, 2)
+    assert _cluster_ids(components.clusters()) == [[0, 1, 2, 3]]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_scc_matches_networkx(seed):
+    import networkx as nx
+
+    nodes = list(range(25))
+    edges = _random_digraph_edges(num_nodes=25, num_edges=40, seed=seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from((e["source"], e["target"]) for e in edges)
+
+    components = find_strongly_connected_components(nodes, edges)
+    assert sorted(map(frozenset, components), key=min) == sorted(
+        map(frozenset, nx.strongly_connected_components(graph)), key=min
+    )
+
+
+def test_scc_handles_long_chains():
+    n = 200_000
+    nodes = list(range(n))
+    edges = [{"source": i, "target": i + 1} for i in range(n - 1)]
+    edges.append({"source": n - 1, "target": 0})
+    assert len(find_strongly_connected_components(nodes, edges)) == 1
+
+
+def test_condensation_layers():
+    nodes = ["ChatInput-1", "a", "b", "c", "d"]
+    edges = [
+        {"source": "ChatInput-1", "target": "a"},
+        {"source": "a", "target": "b"},
+        {"source": "b", "target": "a"},
+        {"source": "b", "target": "c"},
+        {"source": "ChatInput-1", "target": "c"},
+    ]
+    condensation = build_condensation(nodes, edges)
+
+    assert condensation.vertices_layers == [["ChatInput-1", "d"], ["a", "b"], ["c"]]
+    layer_of = {c: i for i, layer in enumerate(condensation.layers) for c in layer}
+    for c, targets in enumerate(condensation.dag):
+        assert all(layer_of[c] < layer_of[d] for d in targets)
+    assert condensation.components == find_strongly_connected_components(nodes, edges)
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.dataframe import dataframe_merge
+from src.data_processing.join import hash_join, join_indices, partitioned_join
+
+LEFT = pd.DataFrame({"k": [1, 2, 2, 4], "a": ["p", "q", "r", "s"]})
+RIGHT = pd.DataFrame({"key": [2, 3, 1, 2], "b": [10, 20, 30, 40]})
+INNER_ROWS = [[1, "p", 30], [2, "q", 10], [2, "q", 40], [2, "r", 10], [2, "r", 40]]
+EXPECTED = {
+    "inner": INNER_ROWS,
+    "left": INNER_ROWS + [[4, "s", None]],
+    "right": [
+        [2, "q", 10],
+        [2, "r", 10],
+        [3, None, 20],
+        [1, "p", 30],
+        [2, "q", 40],
+        [2, "r", 40],
+    ],
+    "outer": INNER_ROWS + [[4, "s", None], [3, None, 20]],
+}
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["k", "a", "b"])
+
+
+def test_dataframe_merge():
+    pd.testing.assert_frame_equal(
+        dataframe_merge(LEFT, RIGHT, "k", "key"), _frame(INNER_ROWS), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+def test_join_types(how):
+    result = hash_join(LEFT, RIGHT, "k", "key", how=how, method="hash")
+    pd.testing.assert_frame_equal(result, _frame(EXPECTED[how]), check_dtype=False)
+
+
+def test_sort_merge_join():
+    right = RIGHT.sort_values("key", kind="stable").reset_index(drop=True)
+    result = hash_join(LEFT, right, "k", "key", method="sort")
+    pd.testing.assert_frame_equal(result, _frame(INNER_ROWS), check_dtype=False)
+    with pytest.raises(ValueError):
+        join_indices(LEFT[["k"]], RIGHT[["key"]], method="sort")
+
+
+def test_multi_column_keys_never_match_missing_values():
+    left = pd.DataFrame({"k": [1, None, 2], "g": ["x", "x", "y"]})
+    right = pd.DataFrame({"key": [1, 1, 2, None], "g": ["x", "y", "y", "x"]})
+    right["b"] = [5, 6, 7, 8]
+    result = hash_join(left, right, ["k", "g"], ["key", "g"], how="left")
+    expected = pd.DataFrame(
+        {"k": [1, None, 2], "g": ["x", "x", "y"], "b": [5, None, 7]}
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_partitioned_join(tmp_path):
+    chunks = [LEFT.iloc[:2], LEFT.iloc[2:]]
+    result = partitioned_join(
+        chunks, RIGHT, "k", "key", partitions=3, spill_dir=tmp_path
+    )
+    pd.testing.assert_frame_equal(
+        _sorted(result), _sorted(_frame(INNER_ROWS)), check_dtype=False
+    )
+    assert list(tmp_path.iterdir()) == []
+
+
+def _frames(make_frame, seed=0, rows=300):
+    left = make_frame(rows, seed, na_fraction=0)[["qty", "kind", "price"]]
+    right = make_frame(rows // 2, seed + 100, na_fraction=0)[["qty", "kind", "code"]]
+    # Shift the right keys so that each side has keys the other lacks.
+    right["qty"] += 25
+    return left.set_axis(["k", "g", "a"], axis=1), right.set_axis(
+        ["key", "g", "b"], axis=1
+    )
+
+
+def _reference_merge(left, right, left_on, right_on):
+    right_dict = {}
+    for i in range(len(right)):
+        right_dict.setdefault(right.iloc[i][right_on], []).append(i)
+    rows = []
+    for i in range(len(left)):
+        left_row = left.iloc[i]
+        for j in right_dict.get(left_row[left_on], []):
+            row = dict(left_row)
+            row.update(
+                {col: right.iloc[j][col] for col in right.columns if col != right_on}
+            )
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_dataframe_merge_matches_row_loop_on_random_frames(make_frame):
+    left, right = _frames(make_frame)
+    left = left.drop(columns="g")
+    result = dataframe_merge(left, right, "k", "key")
+    expected = _reference_merge(left, right, "k", "key")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize("method", ["hash", "sort"])
+def test_join_types_match_pandas_on_random_frames(make_frame, how, method):
+    left, right = _frames(make_frame)
+    left = left.rename(columns={"g": "lg"})
+    if method == "sort":
+        left = left.sort_values("k", kind="stable").reset_index(drop=True)
+        right = right.sort_values("key", kind="stable").reset_index(drop=True)
+    result = hash_join(left, right, "k", "key", how=how, method=method)
+    expected = left.merge(right, left_on="k", right_on="key", how=how)
+    expected["k"] = expected["k"].fillna(expected["key"])
+    expected = expected.drop(columns="key")
+    pd.testing.assert_frame_equal(_sorted(result), _sorted(expected), check_dtype=False)
+
+
+def test_inner_join_keeps_left_order_when_building_on_left():
+    left = pd.DataFrame({"k": [3, 1, 3, 2]})
+    right = pd.DataFrame({"k": [1, 3, 3, 9, 2, 1], "v": range(6)})
+    result = hash_join(left, right, "k")
+    assert result.values.tolist() == [
+        [3, 1],
+        [3, 2],
+        [1, 0],
+        [1, 5],
+        [3, 1],
+        [3, 2],
+        [2, 4],
+    ]
+
+
+def test_multi_column_keys_match_pandas_on_random_frames(make_frame):
+    left, right = _frames(make_frame, seed=1)
+    left.loc[::7, "k"] = np.nan
+    result = hash_join(left, right, ["k", "g"], ["key", "g"], how="left")
+    missing = result["k"].isna()
+    assert missing.sum() == left["k"].isna().sum()
+    assert result.loc[missing, "b"].isna().all()
+    expected = left.dropna(subset=["k"]).merge(
+        right, left_on=["k", "g"], right_on=["key", "g"], how="left"
+    )
+    pd.testing.assert_frame_equal(
+        _sorted(result[~missing]),
+        _sorted(expected.drop(columns="key")),
+        check_dtype=False,
+    )
+
+
+def test_join_indices_rejects_unknown_join_type():
+    with pytest.raises(ValueError):
+        join_indices(LEFT[["k"]], RIGHT[["key"]], how="cross")
+
+
+@pytest.mark.parametrize("how", ["inner", "outer"])
+def test_partitioned_join_matches_in_memory_on_random_frames(make_frame, tmp_path, how):
+    left, right = _frames(make_frame, seed=2)
+    chunks = (left.iloc[i : i + 70] for i in range(0, len(left), 70))
+    result = partitioned_join(
+        chunks, right, "k", "key", how=how, partitions=5, spill_dir=tmp_path
+    )
+    expected = hash_join(left, right, "k", "key", how=how)
+    pd.testing.assert_frame_equal(_sorted(result), _sorted(expected), check_dtype=False)
+    assert list(tmp_path.iterdir()) == []
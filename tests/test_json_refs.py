@@ -0,0 +1,63 @@
+import io
+import json
+
+from src.algorithms.search import (
+    JsonRefGraph,
+    _get_all_json_refs,
+    iter_json_refs_from_file,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "user": {"$ref": "#/$defs/User"},
+        "$ref": {"type": "string"},
+        "tags": {"type": "array", "items": [{"$ref": "#/$defs/Tag"}]},
+    },
+    "$defs": {
+        "User": {
+            "properties": {
+                "address": {"$ref": "#/$defs/Address"},
+                "friends": {"items": {"$ref": "#/$defs/User"}},
+                "note": {"description": 'quoted "$ref": "#/$defs/Fake" text'},
+            }
+        },
+        "Address": {"properties": {"geo": {"anyOf": [{"$ref": "#/$defs/Geo"}]}}},
+        "Geo": {"type": "object"},
+        "Tag": {"properties": {"label": {"$ref": '#/$defs/Esc"aped'}}},
+        "Unused": {"$ref": "#/$defs/Geo"},
+    },
+}
+
+
+def test_get_all_json_refs_handles_deep_nesting():
+    schema = {"$ref": "#/$defs/Leaf"}
+    for _ in range(10_000):
+        schema = {"items": [schema]}
+    assert _get_all_json_refs(schema) == {"#/$defs/Leaf"}
+
+
+def test_streamed_refs_match_parsed_refs():
+    text = json.dumps(SCHEMA, indent=2)
+    expected = _get_all_json_refs(SCHEMA)
+    for chunk_size in (1, 3, 7, 64, 1 << 20):
+        assert set(iter_json_refs_from_file(io.StringIO(text), chunk_size)) == expected
+
+
+def test_ref_graph_closure():
+    graph = JsonRefGraph(SCHEMA)
+    assert graph.refs("#/$defs/Address") == {"#/$defs/Geo"}
+    assert graph.closure("#/$defs/User") == {
+        "#/$defs/User",
+        "#/$defs/Address",
+        "#/$defs/Geo",
+    }
+    assert graph.closure("#/$defs/Geo") == frozenset()
+    assert "#/$defs/Unused" not in graph.required_definitions()
+    assert graph.required_definitions() == {
+        "#/$defs/User",
+        "#/$defs/Address",
+        "#/$defs/Geo",
+        "#/$defs/Tag",
+        '#/$defs/Esc"aped',
+    }
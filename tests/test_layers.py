@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+
+from src.algorithms.graph import build_condensation
+from src.algorithms.search import run_layers, run_layers_async, sort_chat_inputs_first
+
+
+class _FakeGraph:
+    def __init__(self, predecessors):
+        self.predecessors = predecessors
+
+    def get_vertex(self, vertex_id):
+        return vertex_id
+
+    def get_predecessors(self, vertex):
+        return self.predecessors.get(vertex, [])
+
+
+def test_sort_chat_inputs_first_moves_independent_inputs():
+    layers = [["a", "ChatInput-1"], ["ChatInput-2", "b"], ["c"]]
+    result = sort_chat_inputs_first(_FakeGraph({}), layers)
+    assert result == [["ChatInput-1", "ChatInput-2"], ["a"], ["b"], ["c"]]
+
+
+def test_sort_chat_inputs_first_keeps_dependent_inputs():
+    layers = [["a"], ["ChatInput-1", "b"]]
+    graph = _FakeGraph({"ChatInput-1": ["a"]})
+    assert sort_chat_inputs_first(graph, layers) == [["a"], ["ChatInput-1", "b"]]
+
+
+def test_run_layers_respects_layer_order_and_parallelism():
+    nodes = ["ChatInput-1", "x", "y", "z"]
+    edges = [
+        {"source": "ChatInput-1", "target": "x"},
+        {"source": "ChatInput-1", "target": "y"},
+        {"source": "x", "target": "z"},
+        {"source": "y", "target": "z"},
+    ]
+    finished = {}
+    lock = threading.Lock()
+
+    def work(vertex_id):
+        time.sleep(0.05)
+        with lock:
+            finished[vertex_id] = time.perf_counter()
+        return vertex_id.lower()
+
+    report = run_layers(build_condensation(nodes, edges), work, max_workers=4)
+
+    assert report.results == {v: v.lower() for v in nodes}
+    assert len(report.layer_seconds) == 3
+    assert finished["ChatInput-1"] < min(finished["x"], finished["y"])
+    assert max(finished["x"], finished["y"]) < finished["z"]
+    # x and y share a layer, so they overlap instead of taking 0.1s together.
+    assert report.layer_seconds[1] < 0.09
+    assert report.critical_path_seconds == sum(report.layer_seconds)
+
+
+def test_run_layers_async():
+    async def work(vertex_id):
+        await asyncio.sleep(0.01)
+        return len(vertex_id)
+
+    report = asyncio.run(run_layers_async([["ChatInput-1"], ["ab", "abc"]], work))
+    assert report.results == {"ChatInput-1": 11, "ab": 2, "abc": 3}
+    assert len(report.layer_seconds) == 2
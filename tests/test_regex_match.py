@@ -0,0 +1,71 @@
+import random
+import re
+
+from src.algorithms.string import RegexMatcher, regex_match
+
+PATTERNS = {
+    "error": r"ERROR \d+",
+    "warn": r"WARN(ING)?:",
+    "user": r"user=(?P<name>\w+)",
+    "any_digit": r"\d",
+}
+
+
+def _lines(count=500, seed=0):
+    rng = random.Random(seed)
+    pieces = [
+        "ERROR 42",
+        "WARNING:",
+        "WARN:",
+        "user=bob",
+        "7 things",
+        "info",
+        "ERROR x",
+    ]
+    return [rng.choice(pieces) + rng.choice(["", " tail", "!"]) for _ in range(count)]
+
+
+def test_regex_match_unchanged():
+    strings = ["apple", "banana", "apricot", "cherry"]
+    assert regex_match(strings, r"ap") == ["apple", "apricot"]
+
+
+def test_matcher_reports_first_matching_pattern():
+    matcher = RegexMatcher(PATTERNS)
+    for line in _lines():
+        expected = next(
+            (name for name, p in PATTERNS.items() if re.match(p, line)), None
+        )
+        assert matcher.match(line) == expected
+
+
+def test_matcher_falls_back_for_backreferences():
+    matcher = RegexMatcher([r"(a)\1", r"(b)\1"])
+    assert matcher.match("aa") == 0
+    assert matcher.match("bb") == 1
+    assert matcher.match("ab") is None
+
+
+def test_matcher_falls_back_for_numbered_conditionals():
+    matcher = RegexMatcher([r"b", r"(a)?(?(1)x|y)c"])
+    assert matcher.match("axc") == 1
+    assert matcher.match("yc") == 1
+    assert matcher.match("ayc") is None
+    assert matcher.match("b") == 0
+
+
+def test_prefix_filter_respects_literal_flags():
+    assert RegexMatcher(["foo bar", "baz"], flags=re.VERBOSE).match("foobar") == 0
+    assert RegexMatcher(["(?x)foo bar", "baz"]).match("foobar") == 0
+    assert RegexMatcher(["(?i)foo", "baz"]).match("FOO") == 0
+    assert RegexMatcher(["foo", "baz"], flags=re.IGNORECASE).match("BAZ") == 1
+
+
+def test_iter_matches_is_lazy_and_parallel_safe():
+    lines = _lines(2_000, seed=1)
+    matcher = RegexMatcher(["ERROR", "WARN"])
+    expected = [line for line in lines if matcher.match(line) is not None]
+
+    serial = matcher.iter_matches(iter(lines), chunk_size=128)
+    assert next(serial)[0] == expected[0]
+    assert list(matcher.filter(lines, chunk_size=128, workers=2)) == expected
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.dataframe import sort_values
+from src.data_processing.sorting import (
+    external_sort,
+    nlargest,
+    nsmallest,
+    top_k_indices,
+)
+
+SCORES = pd.DataFrame(
+    {
+        "id": [0, 1, 2, 3, 4, 5],
+        "kind": ["b", "a", "b", "a", "c", "a"],
+        "score": [3.0, None, 1.0, 3.0, 2.0, 1.0],
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "ascending,expected", [(True, [1, 3, 5, 0, 2, 4]), (False, [4, 0, 2, 1, 3, 5])]
+)
+def test_sort_values_keeps_ties_in_row_order(ascending, expected):
+    result = sort_values(SCORES, "kind", ascending)
+    assert result["id"].tolist() == expected
+    assert result.index.tolist() == list(range(6))
+
+
+@pytest.mark.parametrize(
+    "na_position,expected",
+    [("last", [3, 5, 1, 0, 2, 4]), ("first", [1, 3, 5, 0, 2, 4])],
+)
+def test_multi_key_sort(na_position, expected):
+    result = sort_values(SCORES, ["kind", "score"], [True, False], na_position)
+    assert result["id"].tolist() == expected
+
+
+def test_top_k():
+    assert nlargest(SCORES, 3, "score")["id"].tolist() == [0, 3, 4]
+    assert nsmallest(SCORES, 3, "score")["id"].tolist() == [2, 5, 4]
+    assert nlargest(SCORES, 10, "score")["id"].tolist() == [0, 3, 4, 2, 5]
+    assert nlargest(SCORES, 0, "score").empty
+
+
+def test_external_sort(tmp_path):
+    chunks = [SCORES.iloc[:4], SCORES.iloc[4:]]
+    result = external_sort(
+        chunks,
+        ["kind", "score"],
+        [True, False],
+        chunk_rows=2,
+        block_rows=1,
+        spill_dir=tmp_path,
+    )
+    assert result["id"].tolist() == [3, 5, 1, 0, 2, 4]
+    assert result["score"].isna().tolist() == [False, False, True, False, False, False]
+    assert list(tmp_path.iterdir()) == []
+
+
+def _bubble_sort(df, by, ascending):
+    indices = list(range(len(df)))
+    for i in range(len(df)):
+        for j in range(len(df) - i - 1):
+            a, b = df.iloc[indices[j]][by], df.iloc[indices[j + 1]][by]
+            if (a > b) if ascending else (a < b):
+                indices[j], indices[j + 1] = indices[j + 1], indices[j]
+    return df.iloc[indices].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_values_matches_bubble_sort_on_random_frames(make_frame, ascending):
+    df = make_frame(rows=60)
+    pd.testing.assert_frame_equal(
+        sort_values(df, "code", ascending), _bubble_sort(df, "code", ascending)
+    )
+
+
+@pytest.mark.parametrize("na_position", ["first", "last"])
+def test_multi_key_sort_matches_pandas_on_random_frames(make_frame, na_position):
+    df = make_frame()
+    by, ascending = ["kind", "score", "code"], [True, False, True]
+    expected = df.sort_values(
+        by, ascending=ascending, na_position=na_position, kind="stable"
+    ).reset_index(drop=True)
+    pd.testing.assert_frame_equal(sort_values(df, by, ascending, na_position), expected)
+
+
+def test_sort_values_rejects_bad_spec():
+    with pytest.raises(ValueError):
+        sort_values(SCORES, ["kind", "score"], [True])
+    with pytest.raises(ValueError):
+        sort_values(SCORES, "kind", na_position="middle")
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 50, 1000])
+def test_top_k_matches_stable_sort_head_on_random_frames(make_frame, n):
+    df = make_frame()
+    for column in ("score", "code"):
+        pd.testing.assert_frame_equal(
+            nlargest(df, n, column),
+            sort_values(df.dropna(subset=[column]), column, False).head(n),
+        )
+        pd.testing.assert_frame_equal(
+            nsmallest(df, n, column),
+            sort_values(df.dropna(subset=[column]), column, True).head(n),
+        )
+
+
+def test_top_k_handles_extreme_integers():
+    values = np.array([np.iinfo(np.int64).min, 3, np.iinfo(np.int64).max, 3])
+    assert top_k_indices(values, 2).tolist() == [2, 1]
+    assert top_k_indices(values, 2, largest=False).tolist() == [0, 1]
+    unsigned = np.array([1, 2**63 + 5, 3], dtype=np.uint64)
+    assert top_k_indices(unsigned, 1).tolist() == [1]
+    assert top_k_indices(unsigned, 3, largest=False).tolist() == [0, 2, 1]
+    with pytest.raises(TypeError):
+        top_k_indices(np.array(["a", "b"]), 1)
+
+
+@pytest.mark.parametrize(
+    "by,ascending", [("kind", True), (["score", "kind"], [False, True])]
+)
+def test_external_sort_matches_in_memory_on_random_frames(
+    make_frame, tmp_path, by, ascending
+):
+    df = make_frame()
+    chunks = (df.iloc[i : i + 45] for i in range(0, len(df), 45))
+    result = external_sort(
+        chunks, by, ascending, chunk_rows=64, block_rows=10, spill_dir=tmp_path
+    )
+    pd.testing.assert_frame_equal(result, sort_values(df, by, ascending))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.algorithms.string import (
+    is_palindrome,
+    is_palindrome_batch,
+    longest_palindromic_substring,
+    word_frequency,
+    word_frequency_batch,
+)
+
+TEXTS = [
+    "A man, a plan, a canal: Panama",
+    "race a car",
+    "",
+    "No 'x' in Nixon",
+    "Ésope reste ici et se repose",
+    "İi",
+    "12321",
+]
+
+
+def _reference_palindrome(text):
+    cleaned = "".join(c.lower() for c in text if c.isalnum())
+    return cleaned == cleaned[::-1]
+
+
+def test_is_palindrome_matches_reference():
+    for text in TEXTS:
+        assert is_palindrome(text) == _reference_palindrome(text)
+
+
+def test_batch_accepts_arrays_series_and_iterables():
+    expected = np.array([_reference_palindrome(t) for t in TEXTS])
+    np.testing.assert_array_equal(is_palindrome_batch(np.array(TEXTS)), expected)
+    np.testing.assert_array_equal(is_palindrome_batch(pd.Series(TEXTS)), expected)
+    np.testing.assert_array_equal(
+        is_palindrome_batch(iter(TEXTS * 50), chunk_size=16, workers=2),
+        np.tile(expected, 50),
+    )
+
+
+def test_word_frequency_batch():
+    texts = ["The cat", "the DOG sat", "", "cat  cat"]
+    expected = word_frequency(" ".join(texts))
+    assert word_frequency_batch(texts, chunk_size=2) == expected
+    assert word_frequency_batch(pd.Series(texts), workers=2) == expected
+
+
+def test_longest_palindromic_substring():
+    assert longest_palindromic_substring("forgeeksskeegfor") == "geeksskeeg"
+    assert longest_palindromic_substring("babad") == "bab"
+    assert longest_palindromic_substring("cbbd") == "bb"
+    assert longest_palindromic_substring("") == ""
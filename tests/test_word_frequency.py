@@ -0,0 +1,54 @@
+import random
+
+from src.algorithms.string import (
+    SpaceSaving,
+    iter_text_chunks,
+    top_k_words,
+    word_frequency,
+    word_frequency_file,
+    word_frequency_stream,
+)
+
+
+def _corpus(words=5_000, seed=0):
+    rng = random.Random(seed)
+    vocabulary = ["alpha", "Beta", "gamma", "déjà", "naïve", "x", "ÜBER"]
+    separators = [" ", "\n", "\t", "  ", "　"]
+    return "".join(
+        rng.choice(vocabulary) * rng.randint(1, 2) + rng.choice(separators)
+        for _ in range(words)
+    )
+
+
+def test_stream_joins_words_across_chunk_edges():
+    text = _corpus()
+    chunks = [text[i : i + 7] for i in range(0, len(text), 7)]
+    assert word_frequency_stream(chunks) == word_frequency(text)
+
+
+def test_file_counts_match_in_memory(tmp_path):
+    text = _corpus(seed=1)
+    path = tmp_path / "corpus.txt"
+    path.write_text(text, encoding="utf-8")
+
+    expected = word_frequency(text)
+    assert word_frequency_file(path, chunk_size=64) == expected
+    assert word_frequency_file(path, chunk_size=256, workers=2) == expected
+    assert "".join(iter_text_chunks(path, chunk_size=50)) == text
+
+
+def test_space_saving_finds_heavy_hitters():
+    rng = random.Random(2)
+    words = ["hot"] * 3_000 + ["warm"] * 1_500
+    words += [f"cold{rng.randrange(10_000)}" for _ in range(5_000)]
+    rng.shuffle(words)
+
+    counter = SpaceSaving(capacity=50)
+    counter.update(words)
+    top = counter.top(2)
+    assert [word for word, _ in top] == ["hot", "warm"]
+    for word, estimate in top:
+        assert estimate - counter.error(word) <= words.count(word) <= estimate
+
+    chunks = [" ".join(words[i : i + 100]) + " " for i in range(0, len(words), 100)]
+    assert [word for word, _ in top_k_words(chunks, k=2)] == ["hot", "warm"]